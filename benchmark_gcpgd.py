@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_gcpgd.py
+==================
+Per-iteration cost of the GCPGD hot loop at small N: wall time and memory
+traffic of the in-place gcpgd iteration (preallocated GCPGDWorkspace) against
+the textbook allocating iteration written with the same library routines.
+
+Allocations are measured with tracemalloc: 'allocs/iter' counts, per outer
+iteration, the executed lines of library (and reference) code during which
+at least one iterate-sized array (N * itemsize bytes) was allocated, SVD
+calls excluded; 'peak' is the transient memory (KiB, above the level before
+the call) allocated by one outer iteration, i.e. the temporaries alive at
+once; 'solve' is the same for a whole max_iter-long solve, which stays flat
+for the in-place loop.
+
+    python3 benchmark_gcpgd.py --N 21,41,81,161 --iters 200
+
+With --steps, the adaptive step sizes are checked instead: outer iterations
+to convergence, wall time (which includes the trial G products of
+'backtracking') and final coefficient error of 'bb' and 'backtracking'
+against the constant tau run. Both return to tau before stopping, so the
+relative error gap stays at the 1e-3 level.
+
+    python3 benchmark_gcpgd.py --steps --N 41 --trials 8
+
+With --large N, the matrix-free path is checked at one large N: a
+ToeplitzPlan, a lanczos Cadzow call and a two-iteration lanczos gcpgd
+(G = Id) must stay O(N) in memory, i.e. never build the dense
+(N-P) x (P+1) index grid or Cadzow buffers. It fails with an
+AssertionError otherwise.
+
+    python3 benchmark_gcpgd.py --large 100001
+"""
+
+import os
+import sys
+import time
+import argparse
+import collections
+import tracemalloc
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from gcpgd_lib import (GCPGDWorkspace, IdentityOperator, MeasurementContext,
+                       cadzow_denoiser, fri_fourier, gcpgd,
+                       measurement_operator,
+                       sample_locations, toeplitz_plan, toeplitz_weights)
+
+
+def reference_iteration(ctx, y, x, N, P, K, w, tau, n_cadzow, alpha=0.5):
+    r"""One allocating GCPGD iteration (every intermediate is a new array)."""
+    grad = ctx.rmatvec(ctx.matvec(x) - y)
+    v = x - tau * (grad / (w ** 1.0))
+    z = cadzow_denoiser(v, N, P, K, n_cadzow, w)
+    x_new = alpha * z + (1.0 - alpha) * v
+    d = x_new - x
+    float(np.sqrt(np.real(np.vdot(d, w * d))))
+    float(np.sqrt(np.real(np.vdot(x, w * x))))
+    return x_new
+
+
+def problem(N, K, rng):
+    M, P = (N - 1) // 2, (N - 1) // 2
+    t = sample_locations(K, 0.5 / K, rng)
+    a = np.exp(1j * rng.uniform(0, 2 * np.pi, K))
+    G = measurement_operator(N, 2 * N, M, rng)
+    xstar = fri_fourier(t, a, M)
+    y = G @ xstar
+    y = y + 0.05 * (rng.standard_normal(y.size) + 1j * rng.standard_normal(y.size))
+    ctx = MeasurementContext(G)
+    w = toeplitz_weights(N, P)
+    return ctx, y, ctx.lstsq(y, 1e-6), P, w, xstar
+
+
+def traced_peak(fn):
+    r"""Transient peak (KiB) allocated by one call of fn."""
+    tracemalloc.start()
+    cur0, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (peak - cur0) / 1024.0
+
+
+def traced_allocations(fn, min_bytes, skip=('robust_svd', 'truncated_svd')):
+    r"""Allocating lines of the code in this directory during one call of fn.
+
+    Returns a Counter of (file, line) -> number of executions during which
+    tracemalloc's peak rose by at least min_bytes; the functions named in
+    skip (the SVD) are run untraced and their allocations are not counted.
+    """
+    here = os.path.abspath(os.path.dirname(__file__))
+    sites = collections.Counter()
+    get, reset = tracemalloc.get_traced_memory, tracemalloc.reset_peak
+    level = [0]
+
+    def mark():
+        reset()
+        level[0] = get()[0]
+
+    def trace_line(frame, event, arg):
+        if get()[1] - level[0] >= min_bytes:
+            sites[os.path.basename(frame.f_code.co_filename),
+                  frame.f_lineno] += 1
+        mark()
+        return trace_line
+
+    def trace_skipped(frame, event, arg):
+        if event == 'return':
+            mark()
+        return trace_skipped
+
+    def trace_call(frame, event, arg):
+        code = frame.f_code
+        if not os.path.abspath(code.co_filename).startswith(here):
+            return None
+        mark()
+        if code.co_name in skip:
+            frame.f_trace_lines = False
+            return trace_skipped
+        return trace_line
+
+    tracemalloc.start()
+    mark()
+    sys.settrace(trace_call)
+    try:
+        fn()
+    finally:
+        sys.settrace(None)
+        tracemalloc.stop()
+    return sites
+
+
+def large_check(N, K, rng):
+    r"""Memory of a ToeplitzPlan, a lanczos Cadzow call and a lanczos gcpgd
+    solve at large N."""
+    P = (N - 1) // 2
+    # budget: a few hundred length-N complex vectors, far below one
+    # (N-P) x (P+1) grid for N in the thousands
+    budget = 256 * 16 * N
+    x = rng.standard_normal(N) + 1j * rng.standard_normal(N)
+    tracemalloc.start()
+    plan = toeplitz_plan(N, P)
+    _, plan_peak = tracemalloc.get_traced_memory()
+    t0 = time.perf_counter()
+    cadzow_denoiser(x, N, P, K, 2, plan.w, svd_method='lanczos', plan=plan)
+    t_cadzow = time.perf_counter() - t0
+    _, cadzow_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    gcpgd(x, IdentityOperator(N), x, N, P, K, plan.w, n_cadzow=2,
+          max_iter=2, tol=0.0, svd_method='lanczos')
+    t_gcpgd = time.perf_counter() - t0
+    _, gcpgd_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"N={N}: plan {plan_peak / 2**20:.1f} MiB; lanczos Cadzow "
+          f"{cadzow_peak / 2**20:.1f} MiB peak, {t_cadzow:.2f} s; lanczos "
+          f"gcpgd {gcpgd_peak / 2**20:.1f} MiB peak, {t_gcpgd:.2f} s")
+    assert 'idx' not in vars(plan) and '_take_idx' not in vars(plan), \
+        'the matrix-free path built the dense index grid'
+    for name, peak in (('cadzow', cadzow_peak), ('gcpgd', gcpgd_peak)):
+        assert peak < budget, \
+            f'{name} peak {peak} B exceeds the O(N) budget {budget} B'
+
+
+def step_check(args, rng):
+    r"""Iterations, time and final error of the adaptive step sizes vs
+    constant tau."""
+    print(f"{'N':>5} {'step':>13} {'iters':>7} {'time s':>8} {'err':>9} "
+          f"{'max rel gap':>12}")
+    for N in (int(n) for n in args.N.split(',')):
+        iters, secs, errs = {}, {}, {}
+        for _ in range(args.trials):
+            ctx, y, x0, P, w, xstar = problem(N, args.K, rng)
+            for step in ('constant', 'bb', 'backtracking'):
+                t0 = time.perf_counter()
+                x, _, n = gcpgd(y, ctx, x0, N, P, args.K, w,
+                                n_cadzow=args.n_cadzow, max_iter=10000,
+                                tol=args.tol, step_size=step,
+                                return_iter=True)
+                secs[step] = secs.get(step, 0.0) + time.perf_counter() - t0
+                iters[step] = iters.get(step, 0) + n
+                errs.setdefault(step, []).append(np.linalg.norm(x - xstar))
+        ref = np.array(errs['constant'])
+        for step in ('constant', 'bb', 'backtracking'):
+            gap = np.max(np.abs(np.array(errs[step]) - ref) / ref)
+            print(f"{N:>5} {step:>13} {iters[step]:>7} {secs[step]:>8.2f} "
+                  f"{np.median(errs[step]):>9.2e} {gap:>12.2e}")
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    p.add_argument('--N', default='21,41,81,161',
+                   help='comma-separated problem sizes (odd)')
+    p.add_argument('--K', type=int, default=3)
+    p.add_argument('--n-cadzow', type=int, default=5)
+    p.add_argument('--iters', type=int, default=200)
+    p.add_argument('--repeat', type=int, default=3,
+                   help='timing repetitions (best is reported)')
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--steps', action='store_true',
+                   help='compare the adaptive step sizes with constant tau')
+    p.add_argument('--trials', type=int, default=8,
+                   help='problems per size (--steps)')
+    p.add_argument('--tol', type=float, default=1e-7,
+                   help='outer stopping tolerance (--steps)')
+    p.add_argument('--large', type=int, default=0,
+                   help='check the O(N) memory of the matrix-free path at '
+                   'this N')
+    args = p.parse_args()
+    rng = np.random.default_rng(args.seed)
+    if args.steps:
+        step_check(args, rng)
+        return
+    if args.large:
+        large_check(args.large, args.K, rng)
+        return
+
+    print(f"{'N':>5} {'variant':>10} {'us/iter':>9} {'allocs/iter':>12} "
+          f"{'peak KiB':>9} {'solve KiB':>10}")
+    for N in (int(n) for n in args.N.split(',')):
+        K = args.K
+        ctx, y, x0, P, w, _ = problem(N, K, rng)
+        tau = 1.0 / (2.0 * ctx.spectral_norm(w)**2)
+        ws = GCPGDWorkspace(N, ctx.shape[0], P, K, x0.dtype)
+
+        def run_reference(n):
+            x = x0.copy()
+            for _ in range(n):
+                x = reference_iteration(ctx, y, x, N, P, K, w, tau,
+                                        args.n_cadzow)
+
+        def run_inplace(n):
+            gcpgd(y, ctx, x0, N, P, K, w, n_cadzow=args.n_cadzow,
+                  max_iter=n, tol=0.0, workspace=ws)
+
+        for name, run in (('reference', run_reference),
+                          ('in-place', run_inplace)):
+            run(2)  # warm caches (plan, norms, workspace)
+            best = np.inf
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                run(args.iters)
+                best = min(best, time.perf_counter() - t0)
+            us = 1e6 * best / args.iters
+            # per-iteration count: 11 iterations minus the setup of one
+            nbytes = N * x0.itemsize
+            counts = [sum(traced_allocations(lambda: run(n), nbytes).values())
+                      for n in (1, 11)]
+            allocs = (counts[1] - counts[0]) / 10.0
+            kib = traced_peak(lambda: run(1))
+            kib_solve = traced_peak(lambda: run(args.iters))
+            print(f"{N:>5} {name:>10} {us:>9.1f} {allocs:>12.1f} "
+                  f"{kib:>9.1f} {kib_solve:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,12 @@
 r"""GCPGD primitives shared across the reproduction scripts.
 
 Submodules:
-  toeplitz      Toeplitz weights/build/adjoint, rank projection, Cadzow denoiser
+  toeplitz      Toeplitz weights/build/adjoint, FFT operator, rank projection,
+                Cadzow denoiser
   signal        FRI location sampling, Fourier coefficients, measurement operator
+  operators     LinearOperator protocol (identity, diagonal, subsampled DFT,
+                NUFFT) and MeasurementContext (per-G cached norms, Gram,
+                pseudo-inverse)
   algorithm     Gamma-gradient GCPGD iteration and Gamma-norm factory
   certificates  Nontangentiality certificate, restricted/global mu, Lemma 4 bound
   recovery      Annihilating-filter location recovery
@@ -10,10 +14,18 @@ Submodules:
 """
 
 from .toeplitz import (toeplitz_weights, build_toeplitz, toeplitz_adjoint_read,
-                       project_toeplitz, project_rank, cadzow_denoiser, robust_svd)
+                       project_toeplitz, project_rank, cadzow_denoiser, robust_svd,
+                       ToeplitzOperator, truncated_svd, SubspaceTracker,
+                       rank_factors, toeplitz_adjoint_lowrank, ToeplitzPlan,
+                       toeplitz_plan, CadzowWorkspace)
 from .signal import sample_locations, fri_fourier, measurement_operator
-from .algorithm import gcpgd, gnorm_factory, cadzow_denoise_pyoneer, run_cpgd, run_genfri
-from .certificates import (check_nontangentiality, mu_gamma_full,
+from .operators import (LinearOperator, IdentityOperator, DiagonalOperator,
+                        SubsampledDFTOperator, NUFFTOperator,
+                        MeasurementContext, measurement_context)
+from .algorithm import (gcpgd, gcpgd_batch, GCPGDWorkspace, gnorm_factory,
+                        cadzow_denoise_pyoneer, run_cpgd, run_genfri)
+from .certificates import (check_nontangentiality,
+                           check_nontangentiality_batch, mu_gamma_full,
                            mu_restricted, sigmaK_lemma4)
 from .recovery import recover_locations
 from .metrics import circular_match_error, average_match_error, wilson_ci
@@ -21,9 +33,15 @@ from .metrics import circular_match_error, average_match_error, wilson_ci
 __all__ = [
     "toeplitz_weights", "build_toeplitz", "toeplitz_adjoint_read",
     "project_toeplitz", "project_rank", "cadzow_denoiser", "robust_svd",
+    "ToeplitzOperator", "truncated_svd", "SubspaceTracker", "rank_factors",
+    "toeplitz_adjoint_lowrank", "ToeplitzPlan", "toeplitz_plan",
+    "CadzowWorkspace",
     "sample_locations", "fri_fourier", "measurement_operator",
-    "gcpgd", "gnorm_factory", "cadzow_denoise_pyoneer", "run_cpgd", "run_genfri",
-    "check_nontangentiality", "mu_gamma_full", "mu_restricted", "sigmaK_lemma4",
+    "LinearOperator", "IdentityOperator", "DiagonalOperator",
+    "SubsampledDFTOperator", "NUFFTOperator", "MeasurementContext",
+    "measurement_context",
+    "gcpgd", "gcpgd_batch", "GCPGDWorkspace", "gnorm_factory", "cadzow_denoise_pyoneer", "run_cpgd", "run_genfri",
+    "check_nontangentiality", "check_nontangentiality_batch", "mu_gamma_full", "mu_restricted", "sigmaK_lemma4",
     "recover_locations", "circular_match_error", "average_match_error",
     "wilson_ci",
 ]
@@ -1,8 +1,14 @@
-r"""GCPGD (Algorithm 1) with the Gamma-gradient step, and the Gamma-norm factory."""
+r"""GCPGD (Algorithm 1) with the Gamma-gradient step (single and batched), and the Gamma-norm factory."""
+
+import functools
+import itertools
 
 import numpy as np
 
-from .toeplitz import (cadzow_denoiser, build_toeplitz, project_rank,
+from .operators import measurement_context
+from .toeplitz import (CadzowWorkspace, SubspaceTracker, ToeplitzOperator,
+                       cadzow_denoiser, build_toeplitz, project_rank,
+                       rank_factors, real_dtype, toeplitz_adjoint_lowrank,
                        toeplitz_adjoint_read)
 
 
@@ -11,6 +17,128 @@ def gnorm_factory(w):
     return lambda u: float(np.sqrt(np.real(np.vdot(u, w * u))))
 
 
+# Adaptive step sizes are kept in [tau, 3 tau] = [1/(2L), 3/(2L)], L = ||G||_Gamma^2:
+# 2/L is where a gradient step on the data fidelity stops decreasing it, so the
+# cap keeps a margin below that bound
+_ADAPTIVE_STEP_MAX = 3.0
+
+# The GCPGD fixed point depends on the step, so the adaptive step sizes only
+# run until the relative Gamma-norm fixed-point residual falls below this
+# multiple of tol; the remaining iterations use tau and converge to its fixed
+# point
+_ADAPTIVE_BURNIN_TOL = 100.0
+
+# Iterations between two residual checks of run_genfri(prune=...)
+_GENFRI_PRUNE_EVERY = 10
+
+
+def _schedule_values(k, tau, step_size, alpha, gamma_power):
+    r"""Step size, relaxation and Gamma power of gcpgd at iteration k (1-based).
+
+    For the adaptive step sizes ('bb', 'backtracking') the returned step is
+    tau, the fallback value; gcpgd computes the actual step.
+    """
+    if step_size in ('constant', 'bb', 'backtracking'):
+        step_size_val = 1.0 * tau
+    elif step_size == 'diminishing':
+        step_size_val = 1.0 * tau / np.sqrt(k)
+    elif step_size == 'diminishing-linear':
+        step_size_val = 1.0 * tau / k
+    elif isinstance(step_size, (int, float)):
+        step_size_val = float(step_size)
+    elif callable(step_size):
+        step_size_val = step_size(k, tau)
+    else:
+        raise ValueError(f"Unknown step_size option: {step_size}")
+
+    if alpha == 'dynamic':
+        alpha_val = 0.5 + 0.5 * (1.0 - np.exp(-0.005 * (k - 1)))
+    elif isinstance(alpha, (int, float)):
+        alpha_val = float(alpha)
+    elif callable(alpha):
+        alpha_val = alpha(k)
+    else:
+        raise ValueError(f"Unknown alpha option: {alpha}")
+
+    if gamma_power == 'dynamic':
+        p_val = np.exp(-0.005 * (k - 1))
+    elif isinstance(gamma_power, (int, float)):
+        p_val = float(gamma_power)
+    elif callable(gamma_power):
+        p_val = gamma_power(k)
+    else:
+        raise ValueError(f"Unknown gamma_power option: {gamma_power}")
+    return step_size_val, alpha_val, p_val
+
+
+def _schedule_iter(opt, val, n, *extra):
+    if callable(opt):
+        return (float(opt(k, *extra)) for k in range(1, n + 1))
+    if np.ndim(val) == 0:
+        return itertools.repeat(float(val), n)
+    return map(float, val)
+
+
+def _schedule_table(n, tau, step_size, alpha, gamma_power):
+    r"""_schedule_values for k = 1..n at once: three iterators of floats.
+
+    Constant options repeat one value, the string schedules are evaluated as
+    one vectorized expression and callables lazily once per k, so the gcpgd
+    loop does no option dispatch and no per-iteration bookkeeping.
+    """
+    const = [1.0 if callable(o) else o for o in (step_size, alpha, gamma_power)]
+    steps, alphas, powers = _schedule_values(np.arange(1, n + 1), tau, *const)
+    return (_schedule_iter(step_size, steps, n, tau),
+            _schedule_iter(alpha, alphas, n),
+            _schedule_iter(gamma_power, powers, n))
+
+
+class GCPGDWorkspace:
+    r"""Preallocated buffers of the gcpgd iteration for (N, L, P, K, dtype).
+
+    Holds the residual, gradient, Gamma^p weights, v, two ping-pong iterates
+    and scratch vectors, so the outer loop runs in place; pass one to
+    gcpgd(..., workspace=ws) to also share them across solves. The
+    CadzowWorkspace of the dense denoiser, O(N^2), is only allocated on first
+    use, i.e. by a svd_method='dense' solve without track_subspace.
+    """
+
+    def __init__(self, N, L, P, K, dtype=complex):
+        self.key = (N, L, P, K, np.dtype(dtype))
+        self.r = np.empty(L, dtype)
+        (self.grad, self.v, self.d, self.x, self.x_new, self.u, self.u_prev,
+         self.grad_prev) = np.empty((8, N), dtype)
+        self.wp = np.empty(N, real_dtype(dtype))
+
+    @functools.cached_property
+    def cadzow(self):
+        r"""Buffers of the dense Cadzow loop, allocated on first use."""
+        N, _, P, K, dtype = self.key
+        return CadzowWorkspace(N, P, K, dtype)
+
+    def fits(self, N, L, P, K, dtype):
+        r"""Whether the buffers match a problem of this size and dtype."""
+        return self.key == (N, L, P, K, np.dtype(dtype))
+
+
+def _armijo_step(ctx, y, x, r, grad, wp, step, step_min, shrink=0.5):
+    r"""Largest step = step * shrink^j (>= step_min) with sufficient decrease
+
+    f(x - s Gamma^{-p} g) <= f(x) - s/2 ||g||^2_{Gamma^{-p}},  f = ||Gx - y||^2 / 2,
+
+    the majorization condition of a gradient step in the Gamma^p metric.
+    """
+    f0 = 0.5 * np.real(np.vdot(r, r))
+    d = grad / wp
+    gd = np.real(np.vdot(grad, d))
+    while step > step_min:
+        rs = ctx.matvec(x - step * d) - y
+        if 0.5 * np.real(np.vdot(rs, rs)) <= f0 - 0.5 * step * gd:
+            return step
+        step *= shrink
+    return step_min
+
+
 def gcpgd(y,
           G,
           x0,
@@ -24,7 +152,16 @@ def gcpgd(y,
           tol=1e-6,
           step_size='constant',
           gamma_power=1.0,
-          return_iter=False):
+          svd_method='dense',
+          track_subspace=False,
+          acceleration=None,
+          anderson_window=5,
+          cadzow_tol=None,
+          dtype=None,
+          refine_iter=0,
+          workspace=None,
+          return_iter=False,
+          return_info=False):
     r"""Run GCPGD with the Gamma-gradient step; return (x, converged_flag).
 
     v = x - step_size_val Gamma^{-p} G^H (G x - y);  z = H_n(v);  x = alpha z + (1-a) v.
@@ -35,8 +172,10 @@ def gcpgd(y,
     -----------
     y : array_like
         Measurements.
-    G : array_like
-        Measurement operator G.
+    G : array_like, operator or MeasurementContext
+        Measurement operator G (dense, or a matrix-free LinearOperator such
+        as IdentityOperator or NUFFTOperator), or a MeasurementContext caching
+        its norm.
     x0 : array_like
         Initial guess for x.
     N, P, K : int
@@ -65,70 +204,336 @@ def gcpgd(y,
         - callable: A function of signature `step_size(k, tau)` returning the
           step size for that iteration, where k is the iteration (1-based index)
           and tau is the base tau value.
+        - 'bb' (experimental): Barzilai-Borwein (short) step in the
+          Gamma^p metric, <du, dg> / ||dg||^2_{Gamma^{-p}} from the last two
+          gradients, clipped to [tau, 3 tau]; the upper bound is halved
+          whenever the Gamma-norm fixed-point residual increases.
+        - 'backtracking' (experimental): Armijo backtracking on
+          ||Gx - y||^2 / 2, starting from twice the previous step and
+          halving down to tau (one extra G product per trial step).
+          The fixed point of GCPGD depends on the step, so both adaptive
+          rules are a burn-in only: once the relative residual is below
+          _ADAPTIVE_BURNIN_TOL * tol the step returns to tau, and the
+          iteration stops at the constant-tau fixed point. The saving is
+          small and problem-dependent: from 0.9x to 1.5x fewer outer
+          iterations than constant tau (median 1.05-1.15x, random G with
+          L = 2N and 4N), and backtracking pays its trial products on top;
+          benchmark_gcpgd.py --steps measures both.
     gamma_power : float, str, or callable, optional
         Exponent p for the Toeplitz-weighting divisor (w**p):
         - float (e.g. 1.0, default): Constant power.
         - 'dynamic': Exponentially decay from 1.0 (GCPGD) to 0.0 (CPGD) as total_iter increases.
         - callable: Function of signature `gamma_power(k)` returning the exponent at iteration k (1-based index).
+    svd_method : str, optional
+        Rank-projection backend of the Cadzow denoiser:
+        - 'dense' (default): Full thin SVD of the Toeplitz matrix.
+        - 'lanczos': Leading K+1 singular triplets only, from FFT-based
+          Toeplitz matvecs (no dense matrix is formed for the SVD).
+    track_subspace : bool or SubspaceTracker, optional
+        If True, carry the leading singular subspace of T_P across Cadzow
+        cycles and outer iterations (a few subspace-iteration steps replace
+        the SVD, with svd_method as fallback). A SubspaceTracker instance
+        may be passed instead to tune it or read its counters.
+    acceleration : str or None, optional
+        Acceleration of the fixed-point map x -> alpha H_n(v) + (1-alpha) v:
+        - None (default): Plain GCPGD iteration.
+        - 'nesterov': FISTA-style momentum on the iterates.
+        - 'anderson': Windowed Anderson (type-II) mixing of the last
+          anderson_window map evaluations, least squares in the Gamma norm.
+        Both restart (drop momentum / history and take the plain step)
+        whenever the Gamma-norm fixed-point residual increases, so the
+        iteration falls back to Algorithm 1 near the solution.
+    anderson_window : int, optional
+        History length of the Anderson mixing (default 5).
+    cadzow_tol : float or None, optional
+        If set, each Cadzow denoising stops once the relative change of its
+        Toeplitz iterate is below cadzow_tol, with n_cadzow as the cap
+        (late outer iterations then need a single cycle).
+    dtype : dtype or None, optional
+        Working precision. None (default) keeps the precision of the inputs;
+        np.complex64 runs the whole iteration (gradient, Toeplitz build, SVD,
+        denoiser) in single precision, for ~1e-4 relative accuracy at about
+        half the memory traffic.
+    refine_iter : int, optional
+        With dtype set, up to refine_iter further iterations in complex128
+        from the single-precision solution (schedules restart at k = 1);
+        the reported iteration and SVD counts include them.
+    workspace : GCPGDWorkspace, optional
+        Preallocated iteration buffers to reuse across calls with the same
+        (N, L, P, K, dtype); one is created per call otherwise. Either way
+        the residual, gradient, Gamma^p weights, iterates and, for
+        svd_method='dense' without track_subspace, the Toeplitz matrix live
+        in its buffers. An outer iteration still allocates inside the SVD
+        and in numpy's buffered ufunc calls (casts to the real weights,
+        broadcasts); adaptive step sizes, acceleration, cadzow_tol,
+        track_subspace and svd_method='lanczos' (FFT adjoint for N >= 256)
+        add temporaries of their own. benchmark_gcpgd.py counts them.
     return_iter : bool, optional
         If True, return total number of iterations.
+    return_info : bool, optional
+        If True, also return a dict with 'n_iter' and 'n_svd', the total
+        number of rank projections (SVDs) spent by the solve, and
+        'subspace', the K leading singular vectors (U, Vh) of the last rank
+        projection of the final Cadzow call, for
+        recover_locations(..., method='esprit', subspace=).
     """
-    Ginv_sqrt = 1.0 / np.sqrt(w)
-    G_scaled = G * Ginv_sqrt[None, :]
-    Gnorm_gamma = np.linalg.norm(G_scaled, 2)
+    if acceleration not in (None, 'nesterov', 'anderson'):
+        raise ValueError(f"Unknown acceleration option: {acceleration}")
+    ctx = measurement_context(G)
+    Gnorm_gamma = ctx.spectral_norm(w)
     tau = 1.0 / (2.0 * Gnorm_gamma**2)
-    Gh = G.conj().T
-    gnorm = gnorm_factory(w)
+    if track_subspace is True:
+        tracker = SubspaceTracker()
+    else:
+        tracker = track_subspace or None
+    if dtype is not None:
+        y_ref, ctx_ref, w_ref = y, ctx, w
+        ctx = ctx.astype(dtype)
+        y = np.asarray(y).astype(dtype)
+        w = w.astype(real_dtype(dtype))
+        x0 = x0.astype(dtype)
+    y = np.asarray(y)
+    wdt = np.result_type(x0.dtype, ctx.dtype, y.dtype, np.complex64)
+    ws = workspace
+    if ws is None or not ws.fits(N, ctx.shape[0], P, K, wdt):
+        ws = GCPGDWorkspace(N, ctx.shape[0], P, K, wdt)
+    # only the dense, untracked denoiser reads the (N-P) x (P+1) buffers
+    cadzow_ws = ws.cadzow if svd_method == 'dense' and tracker is None else None
+    steps, alphas, powers = _schedule_table(max_iter, tau, step_size, alpha,
+                                            gamma_power)
 
-    x = x0.copy()
+    stats = {'n_svd': 0}
+    step_max = _ADAPTIVE_STEP_MAX * tau
+    adapting = step_size in ('bb', 'backtracking')
+    step_prev = tau
+    have_prev = False
+    p_last = None
+    x, x_new = ws.x, ws.x_new
+    x[...] = x0
     converged = False
     total_iter = 0
-    for _ in range(max_iter):
+    # u: point the map is evaluated at (x itself for the plain iteration)
+    u = x
+    t_mom = 1.0
+    res_prev = np.inf
+    hist_f, hist_g = [], []
+    sw = np.sqrt(w)
+    for step_size_val, alpha_val, p_val in zip(steps, alphas, powers):
         total_iter += 1
 
-        if step_size == 'constant':
-            step_size_val = 1.0 * tau
-        elif step_size == 'diminishing':
-            step_size_val = 1.0 * tau / np.sqrt(total_iter)
-        elif step_size == 'diminishing-linear':
-            step_size_val = 1.0 * tau / total_iter
-        elif isinstance(step_size, (int, float)):
-            step_size_val = float(step_size)
-        elif callable(step_size):
-            step_size_val = step_size(total_iter, tau)
-        else:
-            raise ValueError(f"Unknown step_size option: {step_size}")
-
-        if alpha == 'dynamic':
-            alpha_val = 0.5 + 0.5 * (1.0 - np.exp(-0.005 * (total_iter - 1)))
-        elif isinstance(alpha, (int, float)):
-            alpha_val = float(alpha)
-        elif callable(alpha):
-            alpha_val = alpha(total_iter)
+        r = ctx.matvec(u, out=ws.r)
+        np.subtract(r, y, out=r)
+        grad = ctx.rmatvec(r, out=ws.grad)
+        if p_val != p_last:
+            np.power(w, p_val, out=ws.wp)
+            p_last = p_val
+        wp = ws.wp
+        if adapting and step_size == 'bb':
+            step_size_val = step_prev
+            if have_prev:
+                du, dg = u - ws.u_prev, grad - ws.grad_prev
+                curv = np.real(np.vdot(du, dg))
+                if curv > 0:
+                    step_size_val = float(np.clip(
+                        curv / np.real(np.vdot(dg, dg / wp)), tau, step_max))
+            ws.u_prev[...] = u
+            ws.grad_prev[...] = grad
+            have_prev = True
+        elif adapting:
+            step_size_val = _armijo_step(ctx, y, u, r, grad, wp,
+                                         min(2.0 * step_prev, step_max), tau)
+        step_prev = step_size_val
+        # v = u - step (grad / w^p)
+        v = np.divide(grad, wp, out=ws.v)
+        np.multiply(v, step_size_val, out=v)
+        np.subtract(u, v, out=v)
+        z = cadzow_denoiser(v, N, P, K, n_cadzow, w, svd_method, tracker,
+                            tol=cadzow_tol, stats=stats, workspace=cadzow_ws)
+        # x_new = alpha z + (1 - alpha) v
+        np.multiply(z, alpha_val, out=x_new)
+        np.multiply(v, 1.0 - alpha_val, out=ws.d)
+        np.add(x_new, ws.d, out=x_new)
+        # Gamma norms through the d / v scratch buffers (v is consumed)
+        d = np.subtract(x_new, u, out=ws.d)
+        res = float(np.sqrt(np.real(np.vdot(d, np.multiply(w, d, out=v)))))
+        ref = float(np.sqrt(np.real(np.vdot(u, np.multiply(w, u, out=v)))))
+        if res <= tol * max(ref, 1e-12) and not adapting:
+            x = x_new
+            converged = True
+            break
+        # Safeguard: a growing residual restarts to the plain step and
+        # halves the admissible range of the adaptive step sizes
+        restart = res > res_prev
+        res_prev = res
+        if adapting and res <= _ADAPTIVE_BURNIN_TOL * tol * max(ref, 1e-12):
+            adapting = False
+        if restart and step_size == 'bb':
+            step_max = max(tau, 0.5 * step_max)
+        if acceleration is None:
+            x, x_new = x_new, x
+            u = x
+            continue
+
+        if acceleration == 'nesterov':
+            if restart:
+                t_mom = 1.0
+                u = x_new
+            else:
+                t_next = 0.5 * (1.0 + float(np.sqrt(1.0 + 4.0 * t_mom**2)))
+                u = np.subtract(x_new, x, out=ws.u)
+                np.multiply(u, (t_mom - 1.0) / t_next, out=u)
+                np.add(x_new, u, out=u)
+                t_mom = t_next
         else:
-            raise ValueError(f"Unknown alpha option: {alpha}")
-
-        if gamma_power == 'dynamic':
-            p_val = np.exp(-0.005 * (total_iter - 1))
-        elif isinstance(gamma_power, (int, float)):
-            p_val = float(gamma_power)
-        elif callable(gamma_power):
-            p_val = gamma_power(total_iter)
+            if restart:
+                hist_f, hist_g = [], []
+            hist_f.append(x_new - u)
+            hist_g.append(x_new.copy())
+            if len(hist_f) > anderson_window + 1:
+                hist_f.pop(0)
+                hist_g.pop(0)
+            u = x_new
+            if len(hist_f) > 1:
+                # min_theta ||f_k - dF theta||_Gamma; u = g_k - dG theta
+                dF = np.diff(np.array(hist_f), axis=0).T
+                dG = np.diff(np.array(hist_g), axis=0).T
+                theta = np.linalg.lstsq(dF * sw[:, None], hist_f[-1] * sw,
+                                        rcond=1e-10)[0]
+                u = np.subtract(x_new, dG @ theta, out=ws.u)
+        x, x_new = x_new, x
+    x = x.copy()
+    if dtype is not None and refine_iter > 0:
+        x, converged, n_ref, info_ref = gcpgd(
+            y_ref, ctx_ref, x.astype(complex), N, P, K, w_ref, n_cadzow,
+            alpha, refine_iter, tol, step_size, gamma_power, svd_method,
+            tracker or False, acceleration, anderson_window, cadzow_tol,
+            return_iter=True, return_info=True, workspace=workspace)
+        total_iter += n_ref
+        stats['n_svd'] += info_ref['n_svd']
+        stats['subspace'] = info_ref['subspace']
+    out = (x, converged, total_iter) if return_iter else (x, converged)
+    if return_info:
+        out += (dict(n_iter=total_iter, n_svd=stats['n_svd'],
+                     subspace=stats.get('subspace')),)
+    return out
+
+
+def gcpgd_batch(Y,
+                G,
+                X0,
+                N,
+                P,
+                K,
+                w,
+                n_cadzow=5,
+                alpha=0.5,
+                max_iter=2000,
+                tol=1e-6,
+                step_size='constant',
+                gamma_power=1.0,
+                svd_method='dense',
+                cadzow_tol=None,
+                dtype=None,
+                refine_iter=0,
+                return_info=False):
+    r"""Run GCPGD on B instances at once; return (X, converged, n_iter).
+
+    Same iteration and options as gcpgd, applied row-wise to the (B, L)
+    measurements Y from the (B, N) initial guesses X0, with vectorized
+    gradients and one batched Cadzow call per iteration. Each instance is
+    frozen as soon as its own relative Gamma-norm step drops below tol, so
+    X[b], converged[b] and n_iter[b] match gcpgd(Y[b], G[b], X0[b], ...) up
+    to floating-point summation order.
+
+    Parameters:
+    -----------
+    Y : array_like
+        Stacked measurements, shape (B, L).
+    G : array_like, operator or MeasurementContext
+        Measurement operator shared by all instances, shape (L, N) (dense,
+        a matrix-free LinearOperator, or its MeasurementContext), or one dense operator per
+        instance, shape (B, L, N).
+    X0 : array_like
+        Stacked initial guesses, shape (B, N).
+    N, P, K, w, n_cadzow, alpha, max_iter, tol, gamma_power, svd_method,
+    cadzow_tol, dtype, refine_iter :
+        As in gcpgd (the refinement pass continues every instance).
+    step_size : str, float, or callable, optional
+        As in gcpgd, except the adaptive 'bb' and 'backtracking'; with a
+        stacked G, tau is the (B,) array of per-instance values and a
+        callable receives the entries of the active instances.
+    return_info : bool, optional
+        If True, also return a dict with 'n_svd', the number of rank
+        projections summed over all instances.
+    """
+    if isinstance(step_size, str) and step_size in ('bb', 'backtracking'):
+        raise ValueError(f"step_size={step_size!r} is not supported in batch")
+    Y_ref, G_ref, w_ref = Y, G, w
+    Y = np.asarray(Y)
+    X = np.array(X0, dtype=dtype or np.result_type(X0, Y, G.dtype, complex))
+    B = X.shape[0]
+    stacked = isinstance(G, np.ndarray) and G.ndim == 3
+    if stacked:
+        G_scaled = G * (1.0 / np.sqrt(w))
+        tau = 1.0 / (2.0 * np.linalg.norm(G_scaled, 2, axis=(-2, -1))**2)
+        if dtype is not None:
+            G = G.astype(dtype)
+        Gc = G.conj()
+    else:
+        ctx = measurement_context(G)
+        tau = 1.0 / (2.0 * ctx.spectral_norm(w)**2)
+        if dtype is not None:
+            G_ref = ctx
+            ctx = ctx.astype(dtype)
+    if dtype is not None:
+        Y = Y.astype(dtype)
+        w = w.astype(real_dtype(dtype))
+    rdt = real_dtype(X.dtype)
+
+    stats = {'n_svd': 0}
+    converged = np.zeros(B, dtype=bool)
+    n_iter = np.zeros(B, dtype=int)
+    active = np.arange(B)
+    for k in range(1, max_iter + 1):
+        x, y = X[active], Y[active]
+        if stacked:
+            Ga = G[active]
+            r = np.einsum('bln,bn->bl', Ga, x) - y
+            grad = np.einsum('bln,bl->bn', Gc[active], r)
+            tau_a = tau[active]
         else:
-            raise ValueError(f"Unknown gamma_power option: {gamma_power}")
+            grad = ctx.rmatvec(ctx.matvec(x) - y)
+            tau_a = tau
+        step_size_val, alpha_val, p_val = _schedule_values(
+            k, tau_a, step_size, alpha, gamma_power)
+        step_size_val = np.reshape(step_size_val, (-1, 1)).astype(rdt)
+        alpha_val, p_val = float(alpha_val), float(p_val)
 
-        grad = Gh @ (G @ x - y)
         v = x - step_size_val * (grad / (w ** p_val))
-        z = cadzow_denoiser(v, N, P, K, n_cadzow, w)
+        z = cadzow_denoiser(v, N, P, K, n_cadzow, w, svd_method,
+                            tol=cadzow_tol, stats=stats)
         x_new = alpha_val * z + (1.0 - alpha_val) * v
-        if gnorm(x_new - x) <= tol * max(gnorm(x), 1e-12):
-            x = x_new
-            converged = True
+        X[active] = x_new
+        n_iter[active] = k
+
+        d = x_new - x
+        step = np.sqrt(np.real(np.sum(w * d * d.conj(), axis=-1)))
+        ref = np.sqrt(np.real(np.sum(w * x * x.conj(), axis=-1)))
+        done = step <= tol * np.maximum(ref, 1e-12)
+        converged[active[done]] = True
+        active = active[~done]
+        if active.size == 0:
             break
-        x = x_new
-    if return_iter:
-        return x, converged, total_iter
-    return x, converged
+    if dtype is not None and refine_iter > 0:
+        X, converged, n_ref, info_ref = gcpgd_batch(
+            Y_ref, G_ref, X.astype(complex), N, P, K, w_ref, n_cadzow, alpha,
+            refine_iter, tol, step_size, gamma_power, svd_method, cadzow_tol,
+            return_info=True)
+        n_iter = n_iter + n_ref
+        stats['n_svd'] += info_ref['n_svd']
+    if return_info:
+        return X, converged, n_iter, dict(n_svd=stats['n_svd'])
+    return X, converged, n_iter
 
 
 def proj_l2_ball(x, rho):
@@ -139,24 +544,38 @@ def proj_l2_ball(x, rho):
     return rho * x / norm
 
 
-def cadzow_denoise_pyoneer(x, N, P, K, n_iter, w, rho=np.inf):
+def cadzow_denoise_pyoneer(x, N, P, K, n_iter, w, rho=np.inf,
+                           svd_method='dense'):
     r"""Run standard Cadzow denoising with an l2-ball constraint."""
+    w = w.astype(real_dtype(x.dtype), copy=False)
     for _ in range(n_iter):
         x = proj_l2_ball(x, rho)
-        A = build_toeplitz(x, N, P)
-        A = project_rank(A, K)
-        x = toeplitz_adjoint_read(A, N, P) / w
+        if svd_method == 'dense':
+            A = project_rank(build_toeplitz(x, N, P), K)
+            x = toeplitz_adjoint_read(A, N, P) / w
+            continue
+        U, s, Vh = rank_factors(ToeplitzOperator(x, N, P), K, svd_method)
+        x = toeplitz_adjoint_lowrank(U, s, Vh, N, P) / w
     return x
 
 
-def run_cpgd(y, G, N, P, K, w, n_cadzow, max_iter=2000, tol=1e-7, rho=np.inf):
-    r"""Reconstruct FRI coefficients using standard CPGD with projection constraint."""
+def run_cpgd(y, G, N, P, K, w, n_cadzow, max_iter=2000, tol=1e-7, rho=np.inf,
+             svd_method='dense', dtype=None):
+    r"""Reconstruct FRI coefficients using standard CPGD with projection constraint.
+
+    G may be a matrix-free operator or a MeasurementContext, whose cached
+    spectral norm is reused. dtype (e.g. np.complex64) sets the working
+    precision, complex128 by default.
+    """
     import time
-    Gnorm = np.linalg.norm(G, 2)
+    ctx = measurement_context(G)
+    Gnorm = ctx.spectral_norm()
     tau = 1.0 / (Gnorm ** 2)
-    Gh = G.conj().T
+    if dtype is not None:
+        ctx = ctx.astype(dtype)
+        y = np.asarray(y).astype(dtype)
     
-    x = np.zeros(N, dtype=complex)
+    x = np.zeros(N, dtype=dtype or complex)
     total_iter = 0
     t_start = time.time()
     
@@ -164,10 +583,10 @@ def run_cpgd(y, G, N, P, K, w, n_cadzow, max_iter=2000, tol=1e-7, rho=np.inf):
         total_iter += 1
         x_old = x.copy()
         
-        grad = Gh @ (G @ x - y)
+        grad = ctx.rmatvec(ctx.matvec(x) - y)
         v = x - tau * grad
         
-        x = cadzow_denoise_pyoneer(v, N, P, K, n_cadzow, w, rho)
+        x = cadzow_denoise_pyoneer(v, N, P, K, n_cadzow, w, rho, svd_method)
         
         if np.linalg.norm(x_old) > 0:
             rel = np.linalg.norm(x - x_old) / np.linalg.norm(x_old)
@@ -181,87 +600,172 @@ def run_cpgd(y, G, N, P, K, w, n_cadzow, max_iter=2000, tol=1e-7, rho=np.inf):
     return x, total_iter, elapsed
 
 
-def run_genfri(y, G, N, P, K, max_iter=50, nb_init=15, tol=1e-6, rcond=1e-4, seed=4):
-    r"""Reconstruct FRI coefficients using Generalized FRI (GenFRI) algorithm."""
+def run_genfri(y, G, N, P, K, max_iter=50, nb_init=15, tol=1e-6, rcond=1e-4,
+               seed=4, kkt_solver='schur', prune=None, return_info=False):
+    r"""Reconstruct FRI coefficients using Generalized FRI (GenFRI) algorithm.
+
+    G may be a MeasurementContext, whose cached Gram matrix, pseudo-inverse
+    and SVD are reused.
+
+    The nb_init random initializations of the annihilating filter c are run
+    as one batch: every update is a stacked solve over the starts still in
+    play, drawing the same random starts (and, for 'dense', giving bitwise
+    the same iterates) as running them one after another.
+
+    kkt_solver selects how the annihilating-filter update (the KKT system in
+    [c, lambda, b, mu] of size 2N+2) is solved:
+
+    - 'schur' (default): eliminate b and lambda through the whitener
+      W = V Sigma^{-1} of G (factored once) and solve the reduced
+      (P+1) x (P+1) Schur system A c = c0, A = T^H (R W W^H R^H)^{-1} T,
+      with two small QR factorizations per iteration. The reduced system is
+      nonsingular only when G has full column rank; otherwise the KKT matrix
+      itself is singular and the dense path is used.
+    - 'dense': the full KKT solve, the matrix being assembled once per
+      initialization and only its R_c blocks rewritten per iteration.
+
+    tol : float, optional
+        A start stops once the relative change of its filter,
+        ||c_new - c|| / ||c||, falls to tol; None runs all max_iter updates.
+    prune : float, optional
+        Every _GENFRI_PRUNE_EVERY iterations, drop the starts whose residual
+        ||y - G b|| exceeds prune times the best one (e.g. 2.0). None
+        (default) keeps every start.
+    return_info : bool, optional
+        If True, also return a dict with 'n_iter', the (nb_init,) updates
+        run by each start, 'best', the winning start, and 'pruned'.
+
+    total_iter is the number of filter updates summed over the starts.
+    """
     import time
     import warnings
     import scipy.linalg as splin
+    if kkt_solver not in ('schur', 'dense'):
+        raise ValueError(f"Unknown kkt_solver option: {kkt_solver}")
+    if prune is not None and prune < 1.0:
+        raise ValueError(f"prune must be >= 1, got {prune}")
     rng = np.random.default_rng(seed)
     
-    Gh = G.conj().T
-    G_gram = Gh @ G
-    G_pinv = np.linalg.pinv(G, rcond=rcond)
+    ctx = measurement_context(G)
+    G, Gh = ctx.dense, ctx.Gh
+    G_gram = ctx.gram
+    G_pinv = ctx.pinv(rcond)
+    W = ctx.whitener if kkt_solver == 'schur' else None
     beta = G_pinv @ y
     
     T_beta = build_toeplitz(beta, N, P) / np.sqrt(P + 1)
     
-    rhs4 = np.zeros(2 * N + 2, dtype=complex)
+    # R_c (N-P) x N, R_c[i, j] = c[P - (j - i)], gathered (for a stack of
+    # filters) from zero-padded reversed copies of c
+    m = N - P
+    r_idx = np.arange(N)[None, :] - np.arange(m)[:, None] + (m - 1)
+    c_pad = np.zeros((nb_init, N + m - 1), dtype=complex)
+
+    def filter_matrices(C):
+        pad = c_pad[:len(C)]
+        pad[:, m - 1:m + P] = C[:, ::-1]
+        return pad[:, r_idx]
+
+    rhs4 = np.zeros((2 * N + 2, 1), dtype=complex)
     rhs4[-1] = 1.0
     
-    rhs5 = np.zeros(2 * N - P, dtype=complex)
-    rhs5[:N] = Gh @ y
+    rhs5 = np.zeros((2 * N - P, 1), dtype=complex)
+    rhs5[:N, 0] = Gh @ y
+
+    def solve_b(R):
+        # min ||y - G b|| s.t. R_c b = 0, for a stack of R_c
+        mtx_5 = np.zeros((len(R), 2 * N - P, 2 * N - P), dtype=complex)
+        mtx_5[:, :N, :N] = G_gram
+        mtx_5[:, :N, N:] = R.transpose(0, 2, 1).conj()
+        mtx_5[:, N:, :N] = R
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            sol_b = splin.solve(mtx_5, rhs5)[:, :N, 0]
+        err = np.array([np.linalg.norm(y - G @ b) for b in sol_b])
+        return sol_b, err
     
-    best_b = None
-    min_error = np.inf
-    total_iter = 0
     t_start = time.time()
     
+    # random starts, drawn in the order of the sequential loop
+    C0 = np.empty((nb_init, P + 1), dtype=complex)
     for init in range(nb_init):
-        c = rng.standard_normal(P + 1) + 1j * rng.standard_normal(P + 1)
-        c0 = c.copy()
-        
-        row1 = np.zeros((P + 1, P + 1), dtype=complex)
-        row2 = T_beta.transpose().conj()
-        row3 = np.zeros((P + 1, N), dtype=complex)
-        row4 = c0[:, None]
-        mtx_top = np.concatenate((row1, row2, row3, row4), axis=1)
-        
-        mtx_bot = np.zeros((1, 2 * N + 2), dtype=complex)
-        mtx_bot[0, :P + 1] = c0.conj()
+        C0[init] = rng.standard_normal(P + 1) + 1j * rng.standard_normal(P + 1)
+    C_out = C0.copy()
+    n_iter = np.zeros(nb_init, dtype=int)
+    alive = np.ones(nb_init, dtype=bool)
+    # starts still iterating, and their current filters
+    active = np.arange(nb_init)
+    C = C0.copy()
+    
+    if W is None:
+        # [[0, T^H, 0, c0], [T, 0, -R_c, 0], [0, -R_c^H, G^H G, 0],
+        #  [c0^H, 0, 0, 0]]; only the R_c blocks change per iteration
+        i_l, i_b, i_mu = P + 1, N + 1, 2 * N + 1
+        mtx_4 = np.zeros((nb_init, 2 * N + 2, 2 * N + 2), dtype=complex)
+        mtx_4[:, :i_l, i_l:i_b] = T_beta.transpose().conj()
+        mtx_4[:, :i_l, i_mu] = C0
+        mtx_4[:, i_l:i_b, :i_l] = T_beta
+        mtx_4[:, i_b:i_mu, i_b:i_mu] = G_gram
+        mtx_4[:, i_mu, :i_l] = C0.conj()
+    
+    for it in range(max_iter):
+        n_iter[active] += 1
+        c0 = C0[active]
         
-        for it in range(max_iter):
-            total_iter += 1
-            
-            col_c = np.concatenate(([c[-1]], np.zeros(N - P - 1)))
-            row_c = np.concatenate((c[::-1], np.zeros(N - P - 1)))
-            R_c = splin.toeplitz(col_c, row_c)
-            
-            mid2_1 = T_beta
-            mid2_2 = np.zeros((N - P, N - P), dtype=complex)
-            mid2_3 = -R_c
-            mid2_4 = np.zeros((N - P, 1), dtype=complex)
-            mtx_mid2 = np.concatenate((mid2_1, mid2_2, mid2_3, mid2_4), axis=1)
-            
-            mid3_1 = np.zeros((N, P + 1), dtype=complex)
-            mid3_2 = -R_c.transpose().conj()
-            mid3_3 = G_gram
-            mid3_4 = np.zeros((N, 1), dtype=complex)
-            mtx_mid3 = np.concatenate((mid3_1, mid3_2, mid3_3, mid3_4), axis=1)
-            
-            mtx_4 = np.concatenate((mtx_top, mtx_mid2, mtx_mid3, mtx_bot), axis=0)
-            
+        R_c = filter_matrices(C)
+        if W is None:
+            mtx_4[:, i_l:i_b, i_b:i_mu] = -R_c
+            mtx_4[:, i_b:i_mu, i_l:i_b] = -R_c.transpose(0, 2, 1).conj()
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore")
-                sol = splin.solve(mtx_4, rhs4, check_finite=False, assume_a='her')
-                
-            c = sol[:P + 1]
-            
-        col_c = np.concatenate(([c[-1]], np.zeros(N - P - 1)))
-        row_c = np.concatenate((c[::-1], np.zeros(N - P - 1)))
-        R_c = splin.toeplitz(col_c, row_c)
+                sol = splin.solve(mtx_4, rhs4, check_finite=False,
+                                  assume_a='her')
+            C_new = sol[:, :P + 1, 0]
+        else:
+            # R W W^H R^H = Rq^H Rq and T^H (Rq^H Rq)^{-1} T = Rz^H Rz
+            Rq = np.linalg.qr((R_c @ W).transpose(0, 2, 1).conj(), mode='r')
+            Z = splin.solve_triangular(
+                Rq, np.broadcast_to(T_beta, (len(C),) + T_beta.shape),
+                trans='C', check_finite=False)
+            Rz = np.linalg.qr(Z, mode='r')
+            C_new = splin.solve_triangular(
+                Rz, splin.solve_triangular(Rz, c0[:, :, None], trans='C',
+                                           check_finite=False),
+                check_finite=False)[:, :, 0]
+            C_new = C_new / np.sum(c0.conj() * C_new, axis=1)[:, None]
+        C_out[active] = C_new
         
-        recon1 = np.concatenate((G_gram, R_c.transpose().conj()), axis=1)
-        recon2 = np.concatenate((R_c, np.zeros((N - P, N - P), dtype=complex)), axis=1)
-        mtx_5 = np.concatenate((recon1, recon2), axis=0)
+        # relative change of each filter
+        keep = np.ones(len(active), dtype=bool)
+        if tol is not None:
+            step = np.linalg.norm(C_new - C, axis=1)
+            ref = np.linalg.norm(C, axis=1)
+            keep = step > tol * np.maximum(ref, 1e-12)
+        C = C_new
         
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            sol_b = splin.solve(mtx_5, rhs5)[:N]
-            
-        err = np.linalg.norm(y - G @ sol_b)
-        if err < min_error:
-            min_error = err
-            best_b = sol_b
+        if (prune is not None and alive.sum() > 1 and it + 1 < max_iter
+                and (it + 1) % _GENFRI_PRUNE_EVERY == 0):
+            ids = np.flatnonzero(alive)
+            _, err = solve_b(filter_matrices(C_out[ids]))
+            alive[ids[err > prune * err.min()]] = False
+            keep &= alive[active]
+        
+        if not keep.all():
+            active, C = active[keep], C[keep]
+            if W is None:
+                mtx_4 = mtx_4[keep]
+        if active.size == 0:
+            break
+    
+    # the first start attaining the smallest residual wins
+    ids = np.flatnonzero(alive)
+    sol_b, err = solve_b(filter_matrices(C_out[ids]))
+    best = int(np.argmin(err))
+    best_b = sol_b[best]
+    total_iter = int(n_iter.sum())
             
     elapsed = time.time() - t_start
+    if return_info:
+        return best_b, total_iter, elapsed, dict(
+            n_iter=n_iter, best=int(ids[best]), pruned=np.flatnonzero(~alive))
     return best_b, total_iter, elapsed
@@ -1,6 +1,7 @@
 r"""Geometric certificates and theoretical bounds.
 
 check_nontangentiality : Definition 2 principal-angle certificate for T_P(x)
+check_nontangentiality_batch : the same for a (B, N) stack of model vectors
 mu_gamma_full          : global weighted injectivity of G
 mu_restricted          : restricted injectivity on the Gamma-orthonormalized tangent
 sigmaK_lemma4          : Lemma 4 lower bound on sigma_K
@@ -8,10 +9,48 @@ sigmaK_lemma4          : Lemma 4 lower bound on sigma_K
 
 import numpy as np
 
-from .toeplitz import build_toeplitz, toeplitz_weights, robust_svd as svd
-
-
-def check_nontangentiality(x, N, P, K, tol_unit=1e-6):
+from .operators import measurement_context
+from .toeplitz import (ToeplitzOperator, build_toeplitz, toeplitz_plan,
+                       truncated_svd, robust_svd as svd)
+
+
+def _tangent_cross_gram(Uk, Vk, N, P, plan):
+    r"""N x K(m1+m2) cross-Gram Q1^H F of the Toeplitz subspace and the
+    rank-K tangent space at U S V^H; Uk, Vk may be (B, m, K) stacks.
+
+    Principal cosines are the singular values of Q1^H F for any frame F of
+    the tangent space with F F^H its orthogonal projector. Q1 has the
+    orthonormal columns E_i / sqrt(w_i), E_i the 0/1 indicator of the i-th
+    diagonal, and F is built from two mutually orthogonal pieces:
+      U_k e_c^T              (orthonormal; the tangents U X), and
+      (I - U U^H) e_r V_j^H  (Gram (I - U U^H) x I, a projector; the
+                              tangents (I - U U^H) Y V^H).
+    Their inner products with E_i only read the entries of Uk and Vk on that
+    diagonal, so Q1^H F is gathered in O(N K (m1 + m2)) without any
+    vectorized m1*m2 basis.
+    """
+    m1, m2 = plan.shape
+    K = Uk.shape[-1]
+    lead = Uk.shape[:-2]
+    i = np.arange(N)[:, None]
+    # <E_i, U_k e_c^T> = Uk[c + i - P, k], Uk zero-padded by m2-1 rows
+    U_pad = np.zeros(lead + (m1 + 2 * (m2 - 1), K), dtype=Uk.dtype)
+    U_pad[..., m2 - 1:m2 - 1 + m1, :] = Uk
+    C_U = U_pad[..., np.arange(m2)[None, :] + i - P + (m2 - 1), :]
+    # <E_i, e_r V_j^H> = conj(Vk[r - i + P, j]), then project out Uk
+    V_pad = np.zeros(lead + (m2 + 2 * (m1 - 1), K), dtype=Vk.dtype)
+    V_pad[..., m1 - 1:m1 - 1 + m2, :] = Vk.conj()
+    S = V_pad[..., np.arange(m1)[None, :] - i + P + (m1 - 1), :]
+    Uk = Uk[..., None, :, :]
+    C_V = S - Uk.conj() @ (np.swapaxes(Uk, -1, -2) @ S)
+    cross = np.concatenate((C_U.reshape(lead + (N, -1)),
+                            C_V.reshape(lead + (N, -1))), axis=-1)
+    cross /= np.sqrt(plan.w)[:, None]
+    return cross
+
+
+def check_nontangentiality(x, N, P, K, tol_unit=1e-6, svd_method='dense',
+                           plan=None):
     r"""Principal-angle certificate for the nontangentiality of T_P(x).
 
     Computes the principal angles between the Toeplitz subspace T_P and the
@@ -19,48 +58,21 @@ def check_nontangentiality(x, N, P, K, tol_unit=1e-6):
     model point exactly 2K of the cosines equal 1 (the shared tangent
     directions of the exponential model manifold), and the next cosine is the
     angle constant c < 1 whose square-root-free value enters the rate.
+    With svd_method='lanczos' only the K leading singular triplets of T_P(x)
+    are computed, matrix-free, from a ToeplitzOperator.
     """
-    # Build the Toeplitz matrix and get singular vectors for the rank-K manifold
-    m1, m2 = N - P, P + 1
-    A = build_toeplitz(x, N, P)
-    U, s, Vh = svd(A, full_matrices=False)
-    Uk = U[:, :K]
-    Vk = Vh.conj().T[:, :K]
-
-    # Q1: Construct an orthonormal basis for the Toeplitz subspace T_P.
-    # Each column corresponds to one of the N diagonals, scaled by 1/sqrt(w_i)
-    # to ensure orthonormality under the standard Frobenius inner product.
-    w = toeplitz_weights(N, P)
-    rr = np.arange(m1)[:, None]
-    cc = np.arange(m2)[None, :]
-    idx = rr - cc + P
-    Q1 = np.zeros((m1 * m2, N), dtype=complex)
-    for i in range(N):
-        B = (idx == i).astype(float) / np.sqrt(w[i])
-        Q1[:, i] = B.reshape(-1, order='F')
-
-    # Mt: Build a redundant spanning set for the tangent space of the rank-K manifold.
-    # Stack flattened matrices of the form Uk[:, i] @ e_c^T and e_r @ Vk[:, j]^H.
-    cols = []
-    I1 = np.eye(m1)
-    I2 = np.eye(m2)
-    for i in range(K):
-        for c2 in range(m2):
-            cols.append(np.outer(Uk[:, i], I2[c2]).reshape(-1, order='F'))
-    for j in range(K):
-        for r2 in range(m1):
-            cols.append(
-                np.outer(I1[r2], Vk[:, j].conj()).reshape(-1, order='F'))
-    Mt = np.array(cols).T
-
-    # Q2: Orthonormalize Mt using SVD to get a true orthonormal basis for the tangent space.
-    # Columns associated with singular values below the numerical threshold are dropped.
-    Q2, s2, _ = svd(Mt, full_matrices=False)
-    rank2 = int((s2 > s2[0] * 1e-10).sum())
-    Q2 = Q2[:, :rank2]
-
-    # Compute principal cosines as singular values of the cross-correlation matrix Q1^H @ Q2
-    sv = svd(Q1.conj().T @ Q2, compute_uv=False)
+    # Get the singular vectors of T_P(x) spanning the rank-K manifold tangent
+    plan = plan or toeplitz_plan(N, P)
+    m1, m2 = plan.shape
+    Uk, s, Vh = truncated_svd(ToeplitzOperator(x, N, P, plan), K, svd_method)
+    Vk = Vh.conj().T
+
+    cross = _tangent_cross_gram(Uk, Vk, N, P, plan)
+    # the tangent space has dimension K (m1 + m2) - K^2
+    rank2 = K * (m1 + m2) - K * K
+
+    # Principal cosines, in decreasing order
+    sv = svd(cross, compute_uv=False)[:rank2]
     n_unit = int((sv > 1.0 - tol_unit).sum())
     c = float(sv[n_unit]) if n_unit < len(sv) else 1.0
     return dict(n_unit=n_unit,
@@ -71,8 +83,36 @@ def check_nontangentiality(x, N, P, K, tol_unit=1e-6):
                 dims=(N, rank2, m1 * m2))
 
 
+def check_nontangentiality_batch(X, N, P, K, tol_unit=1e-6, plan=None):
+    r"""check_nontangentiality for a (B, N) stack of model vectors.
+
+    All (N, P)-dependent structure is shared, and the SVDs of the B Toeplitz
+    matrices and of the B cross-Grams are two stacked calls. Returns a dict
+    of (B,) arrays n_unit, c, alpha and sigma_K, plus expected_unit and dims.
+    """
+    plan = plan or toeplitz_plan(N, P)
+    m1, m2 = plan.shape
+    X = np.asarray(X)
+    U, s, Vh = svd(build_toeplitz(X, N, P, plan), full_matrices=False)
+    Uk, Vk = U[..., :K], np.swapaxes(Vh[..., :K, :], -1, -2).conj()
+    rank2 = K * (m1 + m2) - K * K
+    sv = svd(_tangent_cross_gram(Uk, Vk, N, P, plan),
+             compute_uv=False)[..., :rank2]
+    n_unit = (sv > 1.0 - tol_unit).sum(axis=-1)
+    c = np.ones(len(sv))
+    has_c = n_unit < sv.shape[-1]
+    c[has_c] = sv[has_c, n_unit[has_c]]
+    return dict(n_unit=n_unit,
+                expected_unit=2 * K,
+                c=c,
+                alpha=np.arccos(np.minimum(c, 1.0)),
+                sigma_K=s[:, K - 1],
+                dims=(N, rank2, m1 * m2))
+
+
 def mu_gamma_full(G, w):
     r"""Global weighted injectivity: sigma_min(G Gamma^{-1/2}) (full column rank)."""
+    G = measurement_context(G).dense
     return float(svd(G * (1.0 / np.sqrt(w))[None, :], compute_uv=False)[-1])
 
 
@@ -82,26 +122,44 @@ def mu_restricted(G, w, t, a, M):
     governs the contraction q and the stability constant 2/mu of Theorem 2.
     The global sigma_min(G Gamma^{-1/2}) is degenerate for irregular Fourier
     sampling, which is precisely why the restricted notion is used.
+
+    sigma_min^2 is the smallest eigenvalue of the 2K x 2K matrix
+    Q^H (G^H G) Q, with the Gram matrix of a dense G computed once and
+    cached on its MeasurementContext, so the cost per model point does not
+    depend on L. A matrix-free G is applied to the 2K basis columns only.
+    t and a may be (B, K) stacks of model points, giving a (B,) array.
     """
+    ctx = measurement_context(G)
+    t, a = np.asarray(t), np.asarray(a)
     # Exponents corresponding to the Fourier series coefficients
     m = np.arange(-M, M + 1)
-    z = np.exp(-2j * np.pi * t)
-    
+    z = np.exp(-2j * np.pi * t)[..., :, None]
+
     # B: Construct the tangent matrix of size N x 2K containing partial derivatives
     # with respect to amplitudes (z_k^m) and locations (a_k * m * z_k^{m-1}).
-    cols = [z_k**m for z_k in z]
-    cols += [a_k * m * z_k**(m - 1) for a_k, z_k in zip(a, z)]
-    B = np.array(cols).T
-    
+    B = np.concatenate((z**m, a[..., :, None] * m * z**(m - 1)), axis=-2)
+    B = np.swapaxes(B, -1, -2)
+
     # Orthonormalize the tangent basis under the Gamma-weighted vector norm.
     # Since the Gamma norm is ||v||_Gamma = ||v * sqrt(w)||_2, we scale B by
     # sqrt(w) and compute the standard QR decomposition to obtain Q.
     sw = np.sqrt(w)
     Q, _ = np.linalg.qr(B * sw[:, None])
-    
+
     # Any vector in the tangent space has the Gamma-orthonormal representation Q / sqrt(w).
-    # We find the minimum singular value of G restricted to this orthonormalized subspace.
-    return float(svd(G @ (Q / sw[:, None]), compute_uv=False)[-1])
+    # sigma_min of G restricted to this subspace is the square root of the
+    # smallest eigenvalue of the Hermitian 2K x 2K matrix QG^H G^H G QG.
+    QG = Q / sw[:, None]
+    QGh = np.swapaxes(QG, -1, -2).conj()
+    if ctx.is_dense:
+        H = QGh @ (ctx.gram @ QG)
+    else:
+        # rows of GQ^T, one per basis column (of every stacked model point)
+        GQt = ctx.matvec(np.swapaxes(QG, -1, -2).reshape(-1, QG.shape[-2]))
+        GQt = GQt.reshape(QG.shape[:-2] + (QG.shape[-1], -1))
+        H = GQt.conj() @ np.swapaxes(GQt, -1, -2)
+    mu = np.sqrt(np.maximum(np.linalg.eigvalsh(H)[..., 0], 0.0))
+    return float(mu) if mu.ndim == 0 else mu
 
 
 def sigmaK_lemma4(amin, N, P, Delta):
@@ -0,0 +1,388 @@
+r"""Measurement operators and the per-G cache shared by the solvers.
+
+LinearOperator        : abstract base of matrix-free G (matvec, rmatvec, norm_bound)
+IdentityOperator      : G = I (denoising only), closed-form norm
+DiagonalOperator      : G = diag(d), closed-form norm
+SubsampledDFTOperator : on-grid Fourier samples by FFT, closed-form norm bound
+NUFFTOperator         : irregular Fourier sampling G_{l,m} = exp(j 2 pi m theta_l)
+                        applied by Gaussian-gridding non-uniform FFTs
+MeasurementContext    : lazily cached adjoint, Gram, pseudo-inverse and
+                        spectral norms of a fixed G (dense or operator)
+"""
+
+import abc
+import functools
+
+import numpy as np
+import scipy.fft as spfft
+
+from .toeplitz import robust_svd as svd
+
+
+class LinearOperator(abc.ABC):
+    r"""Matrix-free measurement operator G of shape L x N.
+
+    Subclasses must implement matvec (G x) and rmatvec (G^H r), both
+    broadcasting over leading dimensions (a subclass missing either cannot be
+    instantiated), and may override norm_bound with a closed-form
+    upper bound on ||G Gamma^{-1/2}||_2; MeasurementContext falls back to
+    power iteration when it returns None. The solvers and certificate helpers
+    accept any object following this protocol in place of a dense G.
+    """
+
+    shape = (0, 0)
+    dtype = np.dtype(complex)
+
+    @abc.abstractmethod
+    def matvec(self, x):
+        r"""G @ x."""
+
+    @abc.abstractmethod
+    def rmatvec(self, r):
+        r"""G^H @ r."""
+
+    def norm_bound(self, w=None):
+        r"""Upper bound on ||G||_2 (||G Gamma^{-1/2}||_2 if w is given), or None."""
+        return None
+
+    def toarray(self):
+        r"""Dense G, one matvec per column (for checks and small problems)."""
+        return self.matvec(np.eye(self.shape[1], dtype=self.dtype)).T
+
+
+def _inv_sqrt_max(w):
+    return 1.0 if w is None else float(np.max(1.0 / np.sqrt(w)))
+
+
+class IdentityOperator(LinearOperator):
+    r"""G = I_N: denoising-only problems at the cost of the Cadzow step alone."""
+
+    def __init__(self, N, dtype=complex):
+        self.shape = (N, N)
+        self.dtype = np.dtype(dtype)
+
+    def matvec(self, x):
+        return x
+
+    def rmatvec(self, r):
+        return r
+
+    def norm_bound(self, w=None):
+        r"""Exact: ||Gamma^{-1/2}||_2 = max_i w_i^{-1/2}."""
+        return _inv_sqrt_max(w)
+
+    def toarray(self):
+        return np.eye(self.shape[0], dtype=self.dtype)
+
+
+class DiagonalOperator(LinearOperator):
+    r"""G = diag(d), e.g. per-coefficient gains or masks."""
+
+    def __init__(self, d):
+        self.d = np.asarray(d)
+        self.shape = (self.d.size, self.d.size)
+        self.dtype = np.result_type(self.d.dtype, np.complex64)
+
+    def matvec(self, x):
+        return self.d * x
+
+    def rmatvec(self, r):
+        return self.d.conj() * r
+
+    def norm_bound(self, w=None):
+        r"""Exact: max_i |d_i| / sqrt(w_i)."""
+        dd = np.abs(self.d) if w is None else np.abs(self.d) / np.sqrt(w)
+        return float(np.max(dd))
+
+    def toarray(self):
+        return np.diag(self.d).astype(self.dtype)
+
+
+class SubsampledDFTOperator(LinearOperator):
+    r"""G_{l,m} = exp(j 2 pi m k_l / n), m = -M..M, for distinct grid rows k_l.
+
+    On-grid irregular sampling (theta_l = k_l / n, n >= N): products are one
+    length-n FFT, O(n log n). The full n-point DFT has orthogonal columns of
+    norm sqrt(n), so sqrt(n) bounds ||G|| for any subset of rows.
+    """
+
+    def __init__(self, rows, n, M):
+        self.rows = np.asarray(rows, dtype=int)
+        self.n, self.M = n, M
+        self.N = 2 * M + 1
+        if n < self.N:
+            raise ValueError(f"grid size n={n} < N={self.N} aliases modes")
+        if np.unique(self.rows % n).size != self.rows.size:
+            raise ValueError("grid rows must be distinct")
+        self.shape = (self.rows.size, self.N)
+        self.dtype = np.dtype(complex)
+        self._modes = np.arange(-M, M + 1) % n
+
+    def matvec(self, x):
+        x = np.asarray(x)
+        H = np.zeros(x.shape[:-1] + (self.n,), dtype=complex)
+        H[..., self._modes] = x
+        return spfft.ifft(H, axis=-1, norm='forward')[..., self.rows % self.n]
+
+    def rmatvec(self, r):
+        r = np.asarray(r)
+        F = np.zeros(r.shape[:-1] + (self.n,), dtype=complex)
+        F[..., self.rows % self.n] = r
+        return spfft.fft(F, axis=-1)[..., self._modes]
+
+    def norm_bound(self, w=None):
+        r"""sqrt(n) max_i w_i^{-1/2} (exact when every grid row is sampled)."""
+        return float(np.sqrt(self.n)) * _inv_sqrt_max(w)
+
+    def toarray(self):
+        m = np.arange(-self.M, self.M + 1)
+        return np.exp(2j * np.pi * np.outer(self.rows, m) / self.n)
+
+
+class NUFFTOperator(LinearOperator):
+    r"""Matrix-free G_{l,m} = exp(j 2 pi m theta_l), m = -M..M, shape L x N.
+
+    G x is a type-2 and G^H r a type-1 non-uniform FFT, both by Gaussian
+    gridding (Greengard & Lee, 2004) on a 2x oversampled grid: each sample is
+    spread to / interpolated from its 2*msp nearest grid points and the
+    Gaussian is deconvolved in frequency. Cost O(N log N + L msp) per product
+    and O(L msp) memory, against O(L N) for the dense matrix; the relative
+    error is about eps (msp grows like -log10(eps)).
+    Products broadcast over leading dimensions: (..., N) -> (..., L) and back.
+    """
+
+    def __init__(self, theta, M, eps=1e-12):
+        self.theta = np.asarray(theta, dtype=float)
+        self.M = M
+        self.N = 2 * M + 1
+        self.shape = (self.theta.size, self.N)
+        self.dtype = np.dtype(complex)
+        self.eps = eps
+        R = 2.0
+        self.msp = int(max(2, np.ceil(-np.log10(eps) / 0.9)))
+        self.n_grid = spfft.next_fast_len(int(np.ceil(R * self.N)))
+        tau = np.pi * self.msp / (self.N**2 * R * (R - 0.5))
+        h = 2.0 * np.pi / self.n_grid
+        x = 2.0 * np.pi * np.mod(self.theta, 1.0)
+        p = (np.floor(x / h).astype(int)[:, None] +
+             np.arange(-self.msp + 1, self.msp + 1)[None, :])
+        self._W = np.exp(-(x[:, None] - p * h)**2 / (4.0 * tau))
+        self._idx = p % self.n_grid
+        m = np.arange(-M, M + 1)
+        self._modes = m % self.n_grid
+        self._deconv = np.sqrt(np.pi / tau) * np.exp(m**2 * tau)
+
+    def matvec(self, x):
+        r"""G @ x (type-2 NUFFT)."""
+        x = np.asarray(x)
+        H = np.zeros(x.shape[:-1] + (self.n_grid,), dtype=complex)
+        H[..., self._modes] = x * self._deconv
+        hg = spfft.ifft(H, axis=-1)
+        return (hg[..., self._idx] * self._W).sum(axis=-1)
+
+    def rmatvec(self, r):
+        r"""G^H @ r (type-1 NUFFT)."""
+        r = np.asarray(r)
+        lead = r.shape[:-1]
+        B = int(np.prod(lead))
+        vals = (r.reshape(B, -1)[:, :, None] * self._W).reshape(B, -1)
+        bins = (self._idx.ravel()[None, :] +
+                self.n_grid * np.arange(B)[:, None]).ravel()
+        size = B * self.n_grid
+        f = (np.bincount(bins, vals.real.ravel(), size) +
+             1j * np.bincount(bins, vals.imag.ravel(), size))
+        F = spfft.fft(f.reshape(B, self.n_grid), axis=-1) / self.n_grid
+        return (F[:, self._modes] * self._deconv).reshape(lead + (self.N,))
+
+    def toarray(self):
+        r"""Dense G (for checks and small problems)."""
+        m = np.arange(-self.M, self.M + 1)
+        return np.exp(2j * np.pi * np.outer(self.theta, m))
+
+
+def _store(a, out):
+    if out is None:
+        return a
+    out[...] = a
+    return out
+
+
+class MeasurementContext:
+    r"""Quantities derived from a fixed measurement operator G, computed once.
+
+    gcpgd, gcpgd_batch, run_cpgd, run_genfri and mu_restricted accept a
+    context in place of G, so that repeated solves with the same G (PSNR
+    sweeps, multiple initializations) share one spectral norm, one Gram
+    matrix and one SVD-based pseudo-inverse instead of recomputing them per
+    call. Everything is computed on first use and cached.
+    G may also be a matrix-free LinearOperator (or any object exposing shape,
+    dtype, matvec and rmatvec): products then never touch a dense matrix,
+    spectral norms come from its norm_bound when available and from power
+    iteration otherwise, and only the Gram matrix and pseudo-inverse densify
+    it (via toarray).
+
+    Parameters:
+    -----------
+    G : array_like or operator
+        Measurement operator, shape L x N.
+    w : array_like, optional
+        Toeplitz weights; needed for tau and the Gamma-weighted norm.
+    norm_method : str, optional
+        - 'exact' (default): spectral norms from an SVD.
+        - 'power': power-iteration estimates on the normal operator, run to
+          relative accuracy norm_tol. Power iteration approaches the norm
+          from below, so the estimate is inflated by 1 + 20 norm_tol (the
+          shortfall at stopping stayed under 7 norm_tol on random NUFFT
+          operators) to keep tau on the conservative side.
+    norm_tol : float, optional
+        Relative stopping tolerance of the power iteration (default 1e-3,
+        about ten products with G and G^H).
+
+    astype(dtype) returns a context applying G in another precision (e.g.
+    complex64), sharing the cached spectral norms.
+    """
+
+    def __init__(self, G, w=None, norm_method='exact', norm_tol=1e-3):
+        if norm_method not in ('exact', 'power'):
+            raise ValueError(f"Unknown norm_method option: {norm_method}")
+        self.G = G
+        self.w = w
+        self.shape = G.shape
+        self.dtype = G.dtype
+        self.is_dense = isinstance(G, np.ndarray)
+        if not self.is_dense:
+            norm_method = 'power'
+        self.norm_method = norm_method
+        self.norm_tol = norm_tol
+        self._norms = {}
+        self._pinvs = {}
+        self._casts = {}
+
+    def astype(self, dtype):
+        r"""Context of the same G applied in dtype (cached; norms shared)."""
+        dtype = np.dtype(dtype)
+        if dtype == self.dtype:
+            return self
+        if dtype not in self._casts:
+            G = self.G.astype(dtype) if self.is_dense else self.G
+            ctx = MeasurementContext(G, self.w, self.norm_method, self.norm_tol)
+            ctx.dtype = dtype
+            ctx._norms = self._norms
+            self._casts[dtype] = ctx
+        return self._casts[dtype]
+
+    def matvec(self, x, out=None):
+        r"""G @ x; x may be a (B, N) stack. out receives the result if given."""
+        if not self.is_dense:
+            return _store(self.G.matvec(x).astype(self.dtype, copy=False), out)
+        if np.ndim(x) == 1:
+            return np.matmul(self.G, x, out=out)
+        return _store(x @ self.G.T, out)
+
+    def rmatvec(self, r, out=None):
+        r"""G^H @ r; r may be a (B, L) stack. out receives the result if given."""
+        if not self.is_dense:
+            return _store(self.G.rmatvec(r).astype(self.dtype, copy=False), out)
+        if np.ndim(r) == 1:
+            return np.matmul(self.Gh, r, out=out)
+        return _store(r @ self.G.conj(), out)
+
+    @functools.cached_property
+    def dense(self):
+        r"""G as a dense matrix (materialized once for matrix-free operators)."""
+        return self.G if self.is_dense else self.G.toarray()
+
+    @functools.cached_property
+    def Gh(self):
+        r"""Adjoint G^H (dense)."""
+        return self.dense.conj().T
+
+    @functools.cached_property
+    def gram(self):
+        r"""Gram matrix G^H G."""
+        return self.Gh @ self.dense
+
+    @functools.cached_property
+    def _svd_conj(self):
+        # thin SVD of conj(G), the factorization np.linalg.pinv works from
+        return svd(self.dense.conj(), full_matrices=False)
+
+    def pinv(self, rcond=1e-15):
+        r"""Moore-Penrose pseudo-inverse of G (np.linalg.pinv semantics).
+
+        One SVD of G is shared by every rcond value.
+        """
+        if rcond not in self._pinvs:
+            u, s, vt = self._svd_conj
+            large = s > rcond * np.max(s)
+            s_inv = np.divide(1, s, where=large, out=np.zeros_like(s))
+            self._pinvs[rcond] = vt.T @ (s_inv[:, None] * u.T)
+        return self._pinvs[rcond]
+
+    @functools.cached_property
+    def whitener(self):
+        r"""W = V Sigma^{-1} with G W orthonormal (W^H G^H G W = I), so that
+        ||G b|| = ||W^{-1} b||; None when G is column-rank deficient
+        (np.linalg.matrix_rank threshold).
+        """
+        _, s, vt = self._svd_conj
+        if s.size < self.shape[1] or s[-1] <= (
+                s[0] * max(self.shape) * np.finfo(s.dtype).eps):
+            return None
+        return vt.T / s[None, :]
+
+    def lstsq(self, y, rcond=1e-15):
+        r"""Least-squares warm start pinv(G) @ y; y may be a (B, L) stack."""
+        Gp = self.pinv(rcond)
+        return Gp @ y if np.ndim(y) == 1 else y @ Gp.T
+
+    def spectral_norm(self, w=None):
+        r"""||G||_2, or ||G Gamma^{-1/2}||_2 = ||G||_Gamma when w is given."""
+        key = None if w is None else np.asarray(w).tobytes()
+        if key not in self._norms:
+            d = None if w is None else 1.0 / np.sqrt(w)
+            bound = (None if self.is_dense else getattr(
+                self.G, 'norm_bound', lambda w: None)(w))
+            if bound is not None:
+                self._norms[key] = float(bound)
+            elif self.norm_method == 'power':
+                self._norms[key] = self._power_norm(d)
+            elif d is None:
+                self._norms[key] = float(np.linalg.norm(self.G, 2))
+            else:
+                self._norms[key] = float(np.linalg.norm(self.G * d[None, :], 2))
+        return self._norms[key]
+
+    def _power_norm(self, d, max_iter=1000):
+        # power iteration on D G^H G D (D = diag(d) or I) from a fixed start
+        rng = np.random.default_rng(0)
+        v = rng.standard_normal(self.shape[1]) + 1j * rng.standard_normal(
+            self.shape[1])
+        v /= np.linalg.norm(v)
+        lam = 0.0
+        for _ in range(max_iter):
+            u = v if d is None else d * v
+            u = self.rmatvec(self.matvec(u))
+            u = u if d is None else d * u
+            lam_new = float(np.linalg.norm(u))
+            if lam_new == 0.0:
+                return 0.0
+            v = u / lam_new
+            if abs(lam_new - lam) <= self.norm_tol * lam_new:
+                break
+            lam = lam_new
+        return float(np.sqrt(lam_new)) * (1.0 + 20.0 * self.norm_tol)
+
+    @property
+    def tau(self):
+        r"""GCPGD step 1 / (2 ||G||_Gamma^2) for the weights given at construction."""
+        if self.w is None:
+            raise ValueError("tau needs the Toeplitz weights w")
+        return 1.0 / (2.0 * self.spectral_norm(self.w)**2)
+
+
+def measurement_context(G, w=None):
+    r"""Return G itself if it is a MeasurementContext, else wrap it in one."""
+    if isinstance(G, MeasurementContext):
+        return G
+    return MeasurementContext(G, w)
@@ -1,21 +1,87 @@
-r"""Location recovery (annihilating filter)."""
+r"""Location recovery (annihilating filter, or ESPRIT on the signal subspace)."""
 
 import numpy as np
 
-from .toeplitz import build_toeplitz, robust_svd as svd
+from .toeplitz import (ToeplitzOperator, build_toeplitz, truncated_svd,
+                       robust_svd as svd)
 
 
-def recover_locations(x, N, P, K):
-    r"""Estimate K Dirac locations from Fourier vector x via annihilating filter.
-
-    The annihilating filter is the right singular vector of T_P(x) for the
-    smallest singular value; its polynomial roots are exp(-j 2 pi t_k).
-    """
-    A = build_toeplitz(x, N, P)
-    _, _, Vh = svd(A, full_matrices=False)
-    h = Vh.conj()[-1]
+def _roots_locations(h, K):
+    # K filter roots closest to the unit circle, as locations in [0, 1)
     roots = np.roots(h)
     order = np.argsort(np.abs(np.abs(roots) - 1.0))
     roots = roots[order[:K]]
     t = np.mod(-np.angle(roots) / (2.0 * np.pi), 1.0)
     return np.sort(t)
+
+
+def _esprit_locations(S, K, inverse=False):
+    # Shift invariance of a (..., m, K) Vandermonde basis S: the eigenvalues of
+    # the K x K least-squares solution of S[:-1] Phi = S[1:] are the nodes.
+    S_up, S_down = S[..., :-1, :], S[..., 1:, :]
+    S_uph = np.swapaxes(S_up, -1, -2).conj()
+    Phi = np.linalg.solve(S_uph @ S_up, S_uph @ S_down)
+    z = np.linalg.eigvals(Phi)
+    if inverse:
+        z = 1.0 / z
+    t = np.mod(-np.angle(z) / (2.0 * np.pi), 1.0)
+    return np.sort(t, axis=-1)
+
+
+def recover_locations(x, N, P, K, svd_method='dense', method='roots',
+                      subspace=None):
+    r"""Estimate K Dirac locations from Fourier vector x via annihilating filter.
+
+    method='roots' (default): the annihilating filter is the right singular
+    vector of T_P(x) for the smallest singular value; its polynomial roots
+    are exp(-j 2 pi t_k), and the K closest to the unit circle are kept.
+    With svd_method='lanczos' only the K leading right singular vectors are
+    computed (matrix-free) and the filter is the minimum-norm vector of their
+    orthogonal complement, (I - V_K V_K^H) e_0.
+
+    method='esprit': matrix pencil on the rank-K signal subspace. The leading
+    K singular vectors of T_P(x) on its longer side span a Vandermonde basis
+    of the nodes exp(-j 2 pi t_k), whose shift invariance yields them as the
+    eigenvalues of a K x K matrix, instead of the roots of a degree-P
+    polynomial. A (B, N) stack x is handled with stacked SVDs, solves and
+    eigenvalue problems, returning (B, K) locations ('roots' loops over the
+    stack).
+
+    subspace : tuple, optional
+        (U, Vh), K (or more) leading left and right singular vectors of
+        T_P(x), or of the last rank-K projection of the solve that produced
+        x (gcpgd(..., return_info=True) reports them as 'subspace'); (B, ...)
+        stacks for a stack x. method='esprit' then needs no SVD. 'roots'
+        uses the smallest singular vector, outside that subspace, and
+        rejects it.
+    """
+    if method not in ('roots', 'esprit'):
+        raise ValueError(f"Unknown recovery method: {method}")
+    if subspace is not None and method != 'esprit':
+        raise ValueError("subspace is only reused by method='esprit'")
+    x = np.asarray(x)
+    if method == 'roots' and x.ndim > 1:
+        return np.array([recover_locations(xb, N, P, K, svd_method, method)
+                         for xb in x])
+    m1, m2 = N - P, P + 1
+    if subspace is not None:
+        U, Vh = subspace
+        U, Vh = U[..., :K], Vh[..., :K, :]
+    elif method == 'esprit' or svd_method == 'dense':
+        if svd_method == 'dense' or x.ndim > 1:
+            U, _, Vh = svd(build_toeplitz(x, N, P), full_matrices=False)
+        else:
+            U, _, Vh = truncated_svd(ToeplitzOperator(x, N, P), K, svd_method)
+        if method == 'roots':
+            return _roots_locations(Vh.conj()[-1], K)
+        U, Vh = U[..., :K], Vh[..., :K, :]
+    else:
+        _, _, Vh = truncated_svd(ToeplitzOperator(x, N, P), K, svd_method)
+    if method == 'roots':
+        h = -Vh.conj().T @ Vh[:, 0]
+        h[0] += 1.0
+        return _roots_locations(h, K)
+    # columns of T_P(x) lie in span{(z_k^r)_r}, its rows in span{(z_k^-c)_c}
+    if m1 >= m2:
+        return _esprit_locations(U, K)
+    return _esprit_locations(np.swapaxes(Vh, -1, -2), K, inverse=True)
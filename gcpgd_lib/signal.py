@@ -2,6 +2,8 @@ r"""FRI signal model: location sampling, Fourier coefficients, measurement opera
 
 import numpy as np
 
+from .operators import NUFFTOperator
+
 
 def sample_locations(K, delta_sep, rng):
     r"""K locations in [0,1) with pairwise circular separation >= delta_sep.
@@ -22,14 +24,23 @@ def sample_locations(K, delta_sep, rng):
     return np.sort(t)
 
 
-def fri_fourier(t, a, M):
-    r"""x_hat_m = sum_k a_k exp(-j 2 pi m t_k), m=-M..M."""
+def fri_fourier(t, a, M, dtype=complex):
+    r"""x_hat_m = sum_k a_k exp(-j 2 pi m t_k), m=-M..M (evaluated in double,
+    returned as dtype)."""
     m = np.arange(-M, M + 1)
-    return (a[None, :] * np.exp(-2j * np.pi * np.outer(m, t))).sum(axis=1)
+    x = (a[None, :] * np.exp(-2j * np.pi * np.outer(m, t))).sum(axis=1)
+    return x.astype(dtype, copy=False)
+
 
+def measurement_operator(N, L, M, rng, nufft_eps=None, dtype=complex):
+    r"""G_{l,m} = exp(j 2 pi m theta_l), theta_l ~ U[0,1), m=-M..M. Shape L x N.
 
-def measurement_operator(N, L, M, rng):
-    r"""G_{l,m} = exp(j 2 pi m theta_l), theta_l ~ U[0,1), m=-M..M. Shape L x N."""
+    With nufft_eps set, the same G is returned as a matrix-free NUFFTOperator
+    of relative accuracy nufft_eps instead of a dense array (wrap it in
+    MeasurementContext(...).astype(dtype) for single precision).
+    """
     theta = np.sort(rng.uniform(0, 1, size=L))
+    if nufft_eps is not None:
+        return NUFFTOperator(theta, M, eps=nufft_eps)
     m = np.arange(-M, M + 1)
-    return np.exp(2j * np.pi * np.outer(theta, m))
+    return np.exp(2j * np.pi * np.outer(theta, m)).astype(dtype, copy=False)
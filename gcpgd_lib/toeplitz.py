@@ -3,17 +3,41 @@ r"""Toeplitz machinery: weights, forward/adjoint, projections, Cadzow denoiser.
 T_P(x) is the (N-P) x (P+1) Toeplitz matrix generated by the length-N vector x.
 Gamma = diag(w) with w = toeplitz_weights(N, P) makes T_P an isometry from
 (C^N, ||.||_Gamma) onto (T_P, ||.||_F).
+ToeplitzOperator applies T_P(x) and its adjoint by FFT without forming it.
+The (N, P)-dependent index grid, weights and FFT sizes live in a ToeplitzPlan,
+built once per (N, P) by the LRU-cached toeplitz_plan and accepted by every
+function of this module; a CadzowWorkspace additionally holds the buffers of
+an in-place (small-N, dense) Cadzow loop.
+Every routine computes in the precision of its input: complex64 data stays in
+complex64 (the weights are cast to float32 on the fly).
 """
 
+import functools
+
 import numpy as np
+import scipy.fft as spfft
 import scipy.linalg as splin
+import scipy.sparse.linalg as spsla
+
+# crossover below which toeplitz_adjoint_lowrank sums the dense product directly
+_LOWRANK_FFT_MIN_N = 256
 
 
 def robust_svd(A, full_matrices=True, compute_uv=True):
-    r"""Robust SVD wrapper that falls back to scipy's QR-based 'gesvd' driver if numpy's default 'gesdd' fails to converge."""
+    r"""Robust SVD wrapper that falls back to scipy's QR-based 'gesvd' driver if numpy's default 'gesdd' fails to converge.
+
+    A may be a (..., m, n) stack; on failure each matrix of the stack is retried individually.
+    """
     try:
         return np.linalg.svd(A, full_matrices=full_matrices, compute_uv=compute_uv)
     except np.linalg.LinAlgError:
+        if A.ndim > 2:
+            out = [robust_svd(a, full_matrices, compute_uv)
+                   for a in A.reshape((-1,) + A.shape[-2:])]
+            if not compute_uv:
+                return np.stack(out).reshape(A.shape[:-2] + out[0].shape)
+            return tuple(np.stack(f).reshape(A.shape[:-2] + f[0].shape)
+                         for f in zip(*out))
         return splin.svd(A, full_matrices=full_matrices, compute_uv=compute_uv, lapack_driver='gesvd')
 
 
@@ -26,46 +50,413 @@ def toeplitz_weights(N, P):
                               np.full(N, n), N - i]).astype(float)
 
 
-def build_toeplitz(x, N, P):
+def real_dtype(dtype):
+    r"""Real floating dtype matching the precision of dtype (float32 or float64)."""
+    return np.finfo(np.result_type(dtype, np.float32)).dtype
+
+
+def _readonly(a):
+    a.setflags(write=False)
+    return a
+
+
+class ToeplitzPlan:
+    r"""(N, P)-dependent structure of T_P, shared through toeplitz_plan.
+
+    Holds the weights w and the FFT length and correlation lags of
+    ToeplitzOperator, all O(N). The dense (N-P) x (P+1) index grid
+    idx[r, c] = r - c + P is built on first use only (build_toeplitz), so
+    the matrix-free paths never allocate it. Its public arrays are read-only.
+    """
+
+    def __init__(self, N, P):
+        self.N, self.P = N, P
+        self.m, self.n = N - P, P + 1
+        self.shape = (self.m, self.n)
+        self.w = _readonly(toeplitz_weights(N, P))
+        self.nfft = spfft.next_fast_len(N)
+        # circular lags c - P, c = 0..P, at which the correlation is read
+        self.lags = _readonly((np.arange(self.n) - P) % self.nfft)
+
+    def _grid(self):
+        return np.arange(self.m)[:, None] - np.arange(self.n)[None, :] + self.P
+
+    @functools.cached_property
+    def idx(self):
+        r"""(N-P) x (P+1) index grid of T_P, idx[r, c] = r - c + P."""
+        return _readonly(self._grid())
+
+    @functools.cached_property
+    def _take_idx(self):
+        # writable twin of idx for np.take(..., out=), which copies read-only
+        # indices on every call
+        return self._grid()
+
+
+@functools.lru_cache(maxsize=128)
+def toeplitz_plan(N, P):
+    r"""Cached ToeplitzPlan for (N, P)."""
+    return ToeplitzPlan(N, P)
+
+
+def build_toeplitz(x, N, P, plan=None, out=None):
     r"""Build the (N-P) x (P+1) Toeplitz matrix T_P(x) from length-N vector x.
 
     Convention: A[r, c] = x[r - c + P], r=0..N-P-1, c=0..P.
+    With out, T_P(x) is written into that preallocated array.
     """
-    m, n = N - P, P + 1
-    r = np.arange(m)[:, None]
-    c = np.arange(n)[None, :]
-    idx = r - c + P
-    return x[idx]
+    plan = plan or toeplitz_plan(N, P)
+    if out is not None:
+        # mode='clip' (idx is in range): the default 'raise' buffers out
+        return np.take(x, plan._take_idx, axis=-1, out=out, mode='clip')
+    return x[..., plan.idx]
 
 
-def toeplitz_adjoint_read(A, N, P):
-    r"""Sum-along-diagonals map: unnormalized adjoint of build_toeplitz."""
-    m, n = N - P, P + 1
-    x = np.zeros(N, dtype=complex)
-    r = np.arange(m)[:, None]
-    c = np.arange(n)[None, :]
-    idx = (r - c + P).ravel()
-    np.add.at(x, idx, A.ravel())
+class CadzowWorkspace:
+    r"""Preallocated buffers of a single-vector dense Cadzow loop for (N, P, K).
+
+    Holds T_P(x) (overwritten by its rank-K projection), the scaled left
+    singular vectors (all min(m, n) of the dense projection, K for the
+    factored one), the zero-padded diagonal-reduction layout of
+    toeplitz_adjoint_read (whose padding stays zero across reuses) and two
+    ping-pong iterates, so that cadzow_denoiser(..., workspace=ws) creates
+    no array of the loop itself; the SVD and numpy's buffered ufunc calls
+    (broadcast scaling by s, division by the real weights) still allocate
+    transient buffers. The returned vector is one of the workspace buffers
+    and is overwritten by the next call.
+    """
+
+    def __init__(self, N, P, K, dtype=complex):
+        self.plan = toeplitz_plan(N, P)
+        m, n = self.plan.shape
+        self.K = K
+        self.dtype = np.dtype(dtype)
+        self.A = np.empty((m, n), dtype)
+        self.Ur = np.empty((m, min(m, n)), dtype)
+        self.Us = np.empty((m, K), dtype)
+        self.Z = np.zeros((m, n + m), dtype)
+        self.x = (np.empty(N, dtype), np.empty(N, dtype))
+
+
+class ToeplitzOperator:
+    r"""Matrix-free T_P(x): FFT-based products with T_P(x) and T_P(x)^H.
+
+    A @ V is the valid part of the linear convolution x * V and A^H @ U the
+    matching cross-correlation; both are exact with a circular FFT of any
+    length >= N, so each product costs O(N log N) per column and the
+    (N-P) x (P+1) matrix is never stored.
+    """
+
+    def __init__(self, x, N, P, plan=None):
+        self.plan = plan or toeplitz_plan(N, P)
+        self.x = np.asarray(x)
+        self.N, self.P = N, P
+        self.shape = self.plan.shape
+        self.dtype = np.result_type(self.x.dtype, np.complex64)
+        self.nfft = self.plan.nfft
+        self._xf = spfft.fft(self.x, self.nfft)
+
+    def matmat(self, V):
+        r"""T_P(x) @ V for V of shape (P+1, k)."""
+        Vf = spfft.fft(V, self.nfft, axis=0)
+        return spfft.ifft(self._xf[:, None] * Vf, axis=0)[self.P:self.N]
+
+    def rmatmat(self, U):
+        r"""T_P(x)^H @ U for U of shape (N-P, k)."""
+        Uf = spfft.fft(U, self.nfft, axis=0)
+        return spfft.ifft(self._xf.conj()[:, None] * Uf, axis=0)[self.plan.lags]
+
+    def matvec(self, v):
+        r"""T_P(x) @ v for a length-(P+1) vector v."""
+        return self.matmat(np.asarray(v).reshape(-1, 1))[:, 0]
+
+    def rmatvec(self, u):
+        r"""T_P(x)^H @ u for a length-(N-P) vector u."""
+        return self.rmatmat(np.asarray(u).reshape(-1, 1))[:, 0]
+
+    def toarray(self):
+        r"""Dense T_P(x) (for checks and small problems)."""
+        return build_toeplitz(self.x, self.N, self.P, self.plan)
+
+    def aslinearoperator(self):
+        r"""View as a scipy.sparse.linalg.LinearOperator (ARPACK, LSQR, ...)."""
+        return spsla.LinearOperator(self.shape,
+                                    matvec=self.matvec,
+                                    rmatvec=self.rmatvec,
+                                    matmat=self.matmat,
+                                    rmatmat=self.rmatmat,
+                                    dtype=self.dtype)
+
+
+def truncated_svd(A, k, method='dense'):
+    r"""Leading k singular triplets (U, s, Vh) of A, s in decreasing order.
+
+    A is a dense matrix or a ToeplitzOperator. method='dense' truncates a full
+    thin SVD; method='lanczos' runs ARPACK (Lanczos on A^H A) through
+    matvecs only, and falls back to the dense SVD when k is too close to
+    min(A.shape) for ARPACK to apply.
+    """
+    if method == 'lanczos' and k < min(A.shape) - 1:
+        Aop = (A.aslinearoperator() if isinstance(A, ToeplitzOperator) else
+               spsla.aslinearoperator(A))
+        U, s, Vh = spsla.svds(Aop, k=k, random_state=0)
+        order = np.argsort(s)[::-1]
+        return U[:, order], s[order], Vh[order]
+    if method not in ('dense', 'lanczos'):
+        raise ValueError(f"Unknown svd method: {method}")
+    if isinstance(A, ToeplitzOperator):
+        A = A.toarray()
+    U, s, Vh = robust_svd(A, full_matrices=False)
+    return U[:, :k], s[:k], Vh[:k]
+
+
+def _matmat(A, V):
+    return A.matmat(V) if isinstance(A, ToeplitzOperator) else A @ V
+
+
+def _rmatmat(A, U):
+    return A.rmatmat(U) if isinstance(A, ToeplitzOperator) else A.conj().T @ U
+
+
+class SubspaceTracker:
+    r"""Leading right singular subspace carried across successive rank steps.
+
+    Consecutive Cadzow cycles (and GCPGD iterations) see nearly the same
+    rank-K subspace, so svd() refines the previous block V with n_refine
+    subspace iterations and one Rayleigh-Ritz step instead of a fresh SVD.
+    When the residual ||A v_k - s_k u_k|| of the K leading pairs exceeds
+    tol * s_1, it falls back to truncated_svd. n_warm / n_exact count both
+    outcomes.
+    """
+
+    def __init__(self, n_refine=1, tol=1e-8, oversample=2):
+        self.n_refine = n_refine
+        self.tol = tol
+        self.oversample = oversample
+        self.V = None
+        self.n_warm = 0
+        self.n_exact = 0
+
+    def svd(self, A, k, method='dense'):
+        r"""Leading k singular triplets (U, s, Vh) of A, warm-started if possible."""
+        b = min(k + self.oversample, min(A.shape))
+        if self.V is not None and self.V.shape == (A.shape[1], b):
+            V = self.V
+            for _ in range(self.n_refine):
+                Q, _ = np.linalg.qr(_matmat(A, V))
+                V, _ = np.linalg.qr(_rmatmat(A, Q))
+            Q, _ = np.linalg.qr(_matmat(A, V))
+            Ub, s, Vh = robust_svd(_rmatmat(A, Q).conj().T,
+                                   full_matrices=False)
+            U = Q @ Ub
+            R = _matmat(A, Vh[:k].conj().T) - U[:, :k] * s[:k]
+            if np.linalg.norm(R) <= self.tol * s[0]:
+                self.n_warm += 1
+                self.V = Vh.conj().T
+                return U[:, :k], s[:k], Vh[:k]
+        U, s, Vh = truncated_svd(A, b, method)
+        self.n_exact += 1
+        self.V = Vh.conj().T
+        return U[:, :k], s[:k], Vh[:k]
+
+
+def toeplitz_adjoint_read(A, N, P, plan=None, out=None, work=None):
+    r"""Sum-along-diagonals map: unnormalized adjoint of build_toeplitz.
+
+    Column-reversed rows of A are laid out in an (m, m+n) zero-padded buffer;
+    read back flat with row length m+n-1, row r is shifted right by r, so every
+    diagonal r - c + P lands in one column and a single sum reduces them all.
+    work may supply that buffer (its padding columns n: must be zero) and out
+    the length-N result.
+    """
+    plan = plan or toeplitz_plan(N, P)
+    m, n = plan.shape
+    lead = A.shape[:-2]
+    if work is None:
+        work = np.zeros(lead + (m, n + m),
+                        dtype=np.result_type(A.dtype, np.complex64))
+    work[..., :n] = A[..., ::-1]
+    Z = work.reshape(lead + (m * (n + m),))[..., :m * (n + m - 1)]
+    return Z.reshape(lead + (m, n + m - 1)).sum(axis=-2, out=out)
+
+
+def toeplitz_adjoint_lowrank(U, s, Vh, N, P, plan=None, out=None,
+                             workspace=None):
+    r"""toeplitz_adjoint_read((U * s) @ Vh) without forming the matrix.
+
+    The diagonal sums of u_k s_k v_k^H are the linear convolution of u_k with
+    the reversed row Vh[k] (length exactly N), so the K terms are summed in
+    the Fourier domain at O(K N log N) cost and no (N-P) x (P+1) intermediate.
+    Below N = _LOWRANK_FFT_MIN_N the FFT overhead dominates and the product is
+    summed directly, in the buffers of a CadzowWorkspace if one is given.
+    """
+    plan = plan or toeplitz_plan(N, P)
+    if N < _LOWRANK_FFT_MIN_N and workspace is not None:
+        ws = workspace
+        np.multiply(U, s, out=ws.Us)
+        np.matmul(ws.Us, Vh, out=ws.A)
+        return toeplitz_adjoint_read(ws.A, N, P, plan, out=out, work=ws.Z)
+    if N < _LOWRANK_FFT_MIN_N:
+        return toeplitz_adjoint_read((U * s[..., None, :]) @ Vh, N, P, plan,
+                                     out=out)
+    nfft = plan.nfft
+    Uf = spfft.fft(U, nfft, axis=-2)
+    Gf = spfft.fft(Vh[..., ::-1], nfft, axis=-1)
+    xf = (Uf * s[..., None, :] * np.swapaxes(Gf, -1, -2)).sum(axis=-1)
+    x = spfft.ifft(xf, axis=-1)[..., :N]
+    if out is not None:
+        out[...] = x
+        return out
     return x
 
 
-def project_toeplitz(A, N, P, w):
+def project_toeplitz(A, N, P, w, plan=None):
     r"""Orthogonal (Frobenius) projection of A onto the Toeplitz subspace."""
-    x = toeplitz_adjoint_read(A, N, P) / w
-    return build_toeplitz(x, N, P)
+    plan = plan or toeplitz_plan(N, P)
+    x = toeplitz_adjoint_read(A, N, P, plan) / w.astype(real_dtype(A.dtype))
+    return build_toeplitz(x, N, P, plan)
+
+
+def rank_factors(A, K, svd_method='dense', tracker=None):
+    r"""Rank-K truncated SVD factors (U, s, Vh) of A, per project_rank's options.
+
+    The dense backend also takes a (B, m, n) stack (one stacked SVD call).
+    """
+    if tracker is not None:
+        return tracker.svd(A, K, svd_method)
+    if svd_method == 'dense' and not isinstance(A, ToeplitzOperator):
+        U, s, Vh = robust_svd(A, full_matrices=False)
+        return U[..., :K], s[..., :K], Vh[..., :K, :]
+    U, s, Vh = truncated_svd(A, K + 1, svd_method)
+    return U[:, :K], s[:K], Vh[:K]
+
 
+def project_rank(A, K, svd_method='dense', tracker=None):
+    r"""Projection onto rank-<=K matrices (truncated SVD).
 
-def project_rank(A, K):
-    r"""Projection onto rank-<=K matrices (truncated SVD)."""
+    svd_method='dense' keeps the head of a full thin SVD of the matrix A;
+    svd_method='lanczos' computes only the K+1 leading triplets from matvecs,
+    so A may also be a ToeplitzOperator. A SubspaceTracker warm-starts the
+    leading subspace from the previous call and uses svd_method as fallback.
+    A (B, m, n) stack is projected matrix by matrix with the dense backend.
+    """
+    if (tracker is None and svd_method == 'dense'
+            and not isinstance(A, ToeplitzOperator)):
+        return _project_rank_dense(A, K)
+    U, s, Vh = rank_factors(A, K, svd_method, tracker)
+    return (U * s[..., None, :]) @ Vh
+
+
+def _project_rank_dense(A, K, out=None, work=None, stats=None):
+    # tail of the full thin SVD zeroed, product over all min(m, n) columns
     U, s, Vh = robust_svd(A, full_matrices=False)
-    s[K:] = 0.0
-    return (U * s) @ Vh
+    if stats is not None:
+        stats['subspace'] = (U[..., :K], Vh[..., :K, :])
+    s[..., K:] = 0.0
+    if out is None:
+        return (U * s[..., None, :]) @ Vh
+    np.multiply(U, s, out=work)
+    return np.matmul(work, Vh, out=out)
+
 
+def cadzow_denoiser(x, N, P, K, n_iter, w, svd_method='dense', tracker=None,
+                    plan=None, tol=None, stats=None, workspace=None):
+    r"""H_n(x) = T_P^+ (Pi_{T_P} Pi_{H_K})^n T_P(x); returns length-N vector.
 
-def cadzow_denoiser(x, N, P, K, n_iter, w):
-    r"""H_n(x) = T_P^+ (Pi_{T_P} Pi_{H_K})^n T_P(x); returns length-N vector."""
-    A = build_toeplitz(x, N, P)
-    for _ in range(n_iter):
-        A = project_rank(A, K)
-        A = project_toeplitz(A, N, P, w)
-    return toeplitz_adjoint_read(A, N, P) / w
+    With svd_method='dense' (and no tracker) each cycle is the dense
+    Pi_{T_P} Pi_{H_K} step: the rank-K projection of T_P(x) is formed and its
+    diagonals averaged, and the result is read back from T_P of the last
+    iterate. With svd_method='lanczos' every rank step runs on the
+    matrix-free ToeplitzOperator of the current iterate, and each cycle goes
+    from the rank-K factors straight to the averaged diagonals
+    (toeplitz_adjoint_lowrank). Passing a SubspaceTracker carries the rank-K
+    subspace from one cycle (and one call) to the next, also through the
+    factored update.
+
+    With tol set, n_iter is only a cap: the cycles stop once the relative
+    Frobenius distance between consecutive Toeplitz iterates,
+    ||T_P(x_new) - T_P(x)||_F / ||T_P(x)||_F (= the Gamma-norm relative
+    change of x), is below tol. A stats dict accumulates the number of rank
+    projections (SVDs) under 'n_svd' and, for 1-D x, keeps the K leading
+    singular vectors (U, Vh) of the last rank projection under 'subspace'
+    (the signal subspace that recover_locations(..., subspace=) reuses).
+
+    x may be a (B, N) stack: with the dense backend all B instances go through
+    one (B, N-P, P+1) stacked SVD per cycle, and with tol set the converged
+    rows drop out of later cycles; the matrix-free backend treats them one by
+    one. A tracker follows a single instance and needs 1-D x.
+
+    A CadzowWorkspace (1-D x only) makes the cycles reuse its buffers; the
+    result is then a workspace buffer, valid until the next call.
+    """
+    plan = plan or toeplitz_plan(N, P)
+    w = w.astype(real_dtype(x.dtype), copy=False)
+    batch = x.ndim > 1
+    ws = workspace
+    if batch:
+        if tracker is not None:
+            raise ValueError("a SubspaceTracker needs a single length-N vector")
+        if ws is not None:
+            raise ValueError("a CadzowWorkspace needs a single length-N vector")
+        if svd_method != 'dense':
+            x = np.stack([
+                cadzow_denoiser(xb, N, P, K, n_iter, w, svd_method, plan=plan,
+                                tol=tol, stats=stats)
+                for xb in x
+            ])
+            if stats is not None:
+                stats.pop('subspace', None)
+            return x
+        if tol is not None:
+            x = np.array(x, dtype=np.result_type(x.dtype, np.complex64))
+            active = np.arange(x.shape[0])
+    dense = svd_method == 'dense' and tracker is None
+    if tol is not None:
+        sw = np.sqrt(w)
+    i = 0
+    for i in range(n_iter):
+        xa = x[active] if batch and tol is not None else x
+        out = None if ws is None else ws.x[i % 2]
+        if svd_method == 'dense':
+            A = build_toeplitz(xa, N, P, plan,
+                               out=None if ws is None else ws.A)
+        else:
+            A = ToeplitzOperator(xa, N, P, plan)
+        if dense:
+            A = _project_rank_dense(A, K, *((None, None) if ws is None else
+                                            (ws.A, ws.Ur)),
+                                    stats=None if batch else stats)
+            x_new = toeplitz_adjoint_read(A, N, P, plan, out=out,
+                                          work=None if ws is None else ws.Z)
+        else:
+            U, s, Vh = rank_factors(A, K, svd_method, tracker)
+            if stats is not None:
+                stats['subspace'] = (U[:, :K], Vh[:K])
+            x_new = toeplitz_adjoint_lowrank(U, s, Vh, N, P, plan, out=out,
+                                             workspace=ws)
+        x_new = np.divide(x_new, w, out=out)
+        if stats is not None:
+            stats['n_svd'] = stats.get('n_svd', 0) + (len(xa) if batch else 1)
+        if tol is None:
+            x = x_new
+            continue
+        change = np.linalg.norm((x_new - xa) * sw, axis=-1)
+        done = change <= tol * np.maximum(
+            np.linalg.norm(xa * sw, axis=-1), 1e-12)
+        if not batch:
+            x = x_new
+            if done:
+                break
+            continue
+        x[active] = x_new
+        active = active[~done]
+        if active.size == 0:
+            break
+    if not dense:
+        return x
+    # T_P^+ of the final Toeplitz iterate T_P(x)
+    out = None if ws is None else ws.x[(i + 1) % 2]
+    A = build_toeplitz(x, N, P, plan, out=None if ws is None else ws.A)
+    x = toeplitz_adjoint_read(A, N, P, plan, out=out,
+                              work=None if ws is None else ws.Z)
+    return np.divide(x, w, out=out)
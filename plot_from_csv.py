@@ -29,8 +29,8 @@ except ImportError:
 try:
     from gcpgd_lib import (
         toeplitz_weights, gnorm_factory, sample_locations, fri_fourier,
-        build_toeplitz, measurement_operator, mu_restricted, check_nontangentiality,
-        sigmaK_lemma4, cadzow_denoiser, robust_svd as svd
+        build_toeplitz, measurement_operator, mu_restricted,
+        check_nontangentiality_batch, sigmaK_lemma4, cadzow_denoiser, robust_svd as svd
     )
     has_lib = True
 except ImportError:
@@ -141,16 +141,15 @@ def plot_geometry(indir, outdir, full=False):
         rng_b = np.random.default_rng(12345)
         geo_trials = 100 if full else 20
         for g in gaps:
-            cc, ss = [], []
+            X = []
             for _ in range(max(5, geo_trials // 4)):
                 extra = list(anchors + 0.12 * np.arange(K - 2))
                 t = np.array([0.08, 0.08 + g] + extra)
                 aa = np.exp(1j * rng_b.uniform(0, 2 * np.pi, K))
-                cert = check_nontangentiality(fri_fourier(t, aa, M), N, P, K)
-                cc.append(cert['c'])
-                ss.append(cert['sigma_K'])
-            c_coll.append(np.median(cc))
-            sk_coll.append(np.median(ss))
+                X.append(fri_fourier(t, aa, M))
+            cert = check_nontangentiality_batch(np.array(X), N, P, K)
+            c_coll.append(np.median(cert['c']))
+            sk_coll.append(np.median(cert['sigma_K']))
             
         axB = axR
         axB.semilogx(gaps, c_coll, 'o-', color='#E24A33', ms=4)
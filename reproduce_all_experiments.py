@@ -20,7 +20,12 @@ produces one figure/CSV pair and validates a named claim:
   outer     Outer-loop validation: noiseless linear rate vs q-tilde, and
             noise-linearity of the limiting error (Theorem 2).
 
-Common options: --fast (default) / --full, --seed, --outdir.
+Common options: --fast (default) / --full, --seed, --outdir, --workers,
+--rng-mode.
+In simulation.csv, 'time' is the wall time of one method on one trial; the
+setup of G (norms, Gram, pseudo-inverse) is shared by every trial of a beta,
+so it is timed once per beta and printed instead. With --workers > 1 the
+trials run concurrently and contend for the cores, so time with --workers 1.
 The basin-collapse experiment lives in reproduce_basin_scaling.py.
 """
 
@@ -29,22 +34,75 @@ import csv
 import os
 
 import numpy as np
-from numpy.linalg import pinv
 
 from gcpgd_lib import (build_toeplitz, cadzow_denoiser, check_nontangentiality,
-                       fri_fourier, gcpgd, gnorm_factory, measurement_operator,
-                       mu_restricted, project_rank, project_toeplitz,
+                       check_nontangentiality_batch, fri_fourier, gcpgd,
+                       gcpgd_batch, gnorm_factory,
+                       measurement_operator, mu_restricted, project_rank,
+                       project_toeplitz,
                        sample_locations, sigmaK_lemma4, toeplitz_weights,
                        wilson_ci, recover_locations, circular_match_error,
                        toeplitz_adjoint_read, cadzow_denoise_pyoneer, run_cpgd,
-                       run_genfri, average_match_error, robust_svd as svd)
-
-
-def measure_ap_rate(x, N, P, K, w, sK, rng, iters=600, pert=0.05):
-    r"""Run inner alternating projections from a tube perturbation; fit rate."""
+                       run_genfri, average_match_error, MeasurementContext,
+                       IdentityOperator,
+                       robust_svd as svd)
+
+
+def _pmap(cfg, fn, tasks):
+    r"""[fn(*task) for task in tasks], fanned out over cfg.workers processes.
+
+    Tasks carry all their random inputs (drawn serially by the caller, in
+    the order of the serial loops) and results come back in task order, so
+    the output does not depend on the number of workers.
+    """
+    tasks = list(tasks)
+    workers = getattr(cfg, 'workers', 1)
+    if workers <= 1 or len(tasks) <= 1:
+        return [fn(*task) for task in tasks]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as ex:
+        return list(ex.map(fn, *zip(*tasks)))
+
+
+def _trial_blocks(cfg, n_trials, n_cells):
+    r"""Split range(n_trials) of each of n_cells grid cells into contiguous
+    blocks, enough of them for n_cells * blocks to cover cfg.workers, so a
+    grid with fewer cells than workers still keeps every process busy.
+    """
+    workers = getattr(cfg, 'workers', 1)
+    n_blocks = min(n_trials, max(1, -(-workers // max(n_cells, 1))))
+    return [range(b[0], b[-1] + 1)
+            for b in np.array_split(np.arange(n_trials), n_blocks)]
+
+
+def _task_rng(cfg, rng, seed, cmd, *key):
+    r"""Random stream of one task of experiment cmd.
+
+    rng_mode 'legacy' returns the shared serial stream rng, so the draws
+    depend on the loop order (the inputs of the original serial scripts).
+    'spawn' returns an independent stream keyed by (cmd, *key) under the run
+    seed, i.e. the child
+    SeedSequence(seed).spawn(...)[crc32(cmd)].spawn(...)[key[0]]..., so any
+    task can be redrawn in isolation, in any order.
+    """
+    if getattr(cfg, 'rng_mode', 'legacy') == 'legacy':
+        return rng
+    import zlib
+    ss = np.random.SeedSequence(seed,
+                                spawn_key=(zlib.crc32(cmd.encode()), ) + key)
+    return np.random.default_rng(ss)
+
+
+def ap_direction(N, P, rng):
+    r"""Random tube-perturbation direction of measure_ap_rate."""
+    shape = (N - P, P + 1)
+    return rng.standard_normal(shape) + 1j * rng.standard_normal(shape)
+
+
+def measure_ap_rate(x, N, P, K, w, sK, d, iters=600, pert=0.05):
+    r"""Run inner alternating projections from a tube perturbation along d
+    (see ap_direction); fit rate."""
     Mstar = build_toeplitz(x, N, P)
-    d = rng.standard_normal(
-        Mstar.shape) + 1j * rng.standard_normal(Mstar.shape)
     A = project_toeplitz(Mstar + pert * sK * d / np.linalg.norm(d), N, P, w)
     traj = [A]
     for _ in range(iters):
@@ -62,26 +120,35 @@ def measure_ap_rate(x, N, P, K, w, sK, rng, iters=600, pert=0.05):
 # --------------------------------------------------------------------------- #
 #  rate
 # --------------------------------------------------------------------------- #
+def _rate_task(x, N, P, K, sK, d):
+    return measure_ap_rate(x, N, P, K, toeplitz_weights(N, P), sK, d)
+
+
 def cmd_rate(cfg, rng=None):
-    rows = []
+    rows, tasks, slots = [], [], []
     for _sd in cfg.seeds:
         rng = np.random.default_rng(_sd)
-        for (K, M) in cfg.rate_KM:
+        for ik, (K, M) in enumerate(cfg.rate_KM):
             N, P = 2 * M + 1, M
-            w = toeplitz_weights(N, P)
-            for dsep in cfg.rate_deltas:
-                for _ in range(cfg.rate_trials):
-                    t = sample_locations(K, dsep, rng)
-                    a = np.exp(1j * rng.uniform(0, 2 * np.pi, K))
+            for idel, dsep in enumerate(cfg.rate_deltas):
+                for trial in range(cfg.rate_trials):
+                    r = _task_rng(cfg, rng, _sd, 'rate', ik, idel, trial)
+                    t = sample_locations(K, dsep, r)
+                    a = np.exp(1j * r.uniform(0, 2 * np.pi, K))
                     x = fri_fourier(t, a, M)
                     cert = check_nontangentiality(x, N, P, K)
                     if cert['n_unit'] != 2 * K:
                         rows.append((K, M, dsep, cert['n_unit'], np.nan,
                                      np.nan, cert['sigma_K']))
                         continue
-                    rate = measure_ap_rate(x, N, P, K, w, cert['sigma_K'], rng)
+                    # the rate is measured below, possibly in parallel
+                    tasks.append((x, N, P, K, cert['sigma_K'],
+                                  ap_direction(N, P, r)))
+                    slots.append(len(rows))
                     rows.append((K, M, dsep, cert['n_unit'], cert['c']**2,
-                                 rate, cert['sigma_K']))
+                                 None, cert['sigma_K']))
+    for i, rate in zip(slots, _pmap(cfg, _rate_task, tasks)):
+        rows[i] = rows[i][:5] + (rate,) + rows[i][6:]
     _write_csv(
         cfg, 'rate',
         ['K', 'M', 'delta', 'n_unit', 'c2_pred', 'rate_meas', 'sigma_K'], rows)
@@ -116,25 +183,39 @@ def cmd_rate(cfg, rng=None):
 # --------------------------------------------------------------------------- #
 #  geometry
 # --------------------------------------------------------------------------- #
+def _geometry_task(X, amins, N, P, K, dsep):
+    cert = check_nontangentiality_batch(X, N, P, K)
+    rows = []
+    for b, amin in enumerate(amins):
+        bnd = sigmaK_lemma4(amin, N, P, dsep)
+        rows.append((dsep, int(cert['n_unit'][b]), float(cert['c'][b]),
+                     float(cert['sigma_K'][b]), amin, bnd))
+    return rows
+
+
 def cmd_geometry(cfg, rng=None):
     K, M = cfg.geo_K, cfg.geo_M
     N, P = 2 * M + 1, M
-    rows = []
+    tasks = []
+    blocks = _trial_blocks(cfg, cfg.geo_trials,
+                           len(cfg.seeds) * len(cfg.geo_deltas))
     for _sd in cfg.seeds:
         rng = np.random.default_rng(_sd)
-        for dsep in cfg.geo_deltas:
-            for _ in range(cfg.geo_trials):
-                t = sample_locations(K, dsep, rng)
+        for idel, dsep in enumerate(cfg.geo_deltas):
+            X, amins = [], []
+            for trial in range(cfg.geo_trials):
+                r = _task_rng(cfg, rng, _sd, 'geometry', idel, trial)
+                t = sample_locations(K, dsep, r)
                 # varied amplitudes so min|a_k| (which drives the Lemma 4 bound)
                 # is a genuine per-instance quantity, not a constant
-                a = np.exp(1j * rng.uniform(0, 2 * np.pi, K)) * rng.uniform(
+                a = np.exp(1j * r.uniform(0, 2 * np.pi, K)) * r.uniform(
                     0.6, 1.4, K)
-                x = fri_fourier(t, a, M)
-                cert = check_nontangentiality(x, N, P, K)
-                amin = float(np.min(np.abs(a)))
-                bnd = sigmaK_lemma4(amin, N, P, dsep)
-                rows.append((dsep, cert['n_unit'], cert['c'], cert['sigma_K'],
-                             amin, bnd))
+                X.append(fri_fourier(t, a, M))
+                amins.append(float(np.min(np.abs(a))))
+            X = np.array(X)
+            tasks += [(X[b.start:b.stop], amins[b.start:b.stop], N, P, K,
+                       dsep) for b in blocks]
+    rows = [r for block in _pmap(cfg, _geometry_task, tasks) for r in block]
     _write_csv(cfg, 'geometry',
                ['delta', 'n_unit', 'c', 'sigma_K', 'amin', 'sigmaK_bound'],
                rows)
@@ -203,16 +284,15 @@ def cmd_geometry(cfg, rng=None):
         anchors = 0.55
         rng_b = np.random.default_rng(12345)
         for g in gaps:
-            cc, ss = [], []
+            X = []
             for _ in range(max(5, cfg.geo_trials // 4)):
                 extra = list(anchors + 0.12 * np.arange(K - 2))
                 t = np.array([0.08, 0.08 + g] + extra)
                 aa = np.exp(1j * rng_b.uniform(0, 2 * np.pi, K))
-                cert = check_nontangentiality(fri_fourier(t, aa, M), N, P, K)
-                cc.append(cert['c'])
-                ss.append(cert['sigma_K'])
-            c_coll.append(np.median(cc))
-            sk_coll.append(np.median(ss))
+                X.append(fri_fourier(t, aa, M))
+            cert = check_nontangentiality_batch(np.array(X), N, P, K)
+            c_coll.append(np.median(cert['c']))
+            sk_coll.append(np.median(cert['sigma_K']))
         axB = axR
         axB.semilogx(gaps, c_coll, 'o-', color='#E24A33', ms=4)
         axB.set_xlabel(r'colliding-pair gap', fontsize=20)
@@ -241,6 +321,35 @@ def cmd_geometry(cfg, rng=None):
 # --------------------------------------------------------------------------- #
 #  phase
 # --------------------------------------------------------------------------- #
+def _phase_task(cfg, t, a, G, E):
+    r"""One collision-ensemble trial: (sigma_K, mu, success per PSNR)."""
+    K, M = cfg.ph_K, cfg.ph_M
+    N, P = 2 * M + 1, M
+    w = toeplitz_weights(N, P)
+    gn = gnorm_factory(w)
+    xstar = fri_fourier(t, a, M)
+    sK = float(svd(build_toeplitz(xstar, N, P), compute_uv=False)[K - 1])
+    # one cached norm / pseudo-inverse per G, shared by all PSNRs
+    ctx = MeasurementContext(G, w)
+    mu = mu_restricted(ctx, w, t, a, M)
+    Gp = ctx.pinv(1e-6)
+    # all PSNR levels share G: solve them as one batch
+    Y = np.array([G @ xstar + eps for eps in E])
+    Xh, _, _ = gcpgd_batch(Y,
+                           ctx,
+                           Y @ Gp.T,
+                           N,
+                           P,
+                           K,
+                           w,
+                           n_cadzow=cfg.ph_ncad,
+                           alpha=0.5,
+                           max_iter=cfg.ph_maxit,
+                           tol=1e-12)
+    ok = np.array([gn(xh - xstar) <= 0.1 * sK for xh in Xh], dtype=int)
+    return sK, mu, ok
+
+
 def cmd_phase(cfg, rng=None):
     r"""Phase diagram on the COLLISION ensemble: one Dirac pair at gap Delta
     (the binding separation), remaining nodes fixed far apart, so that sigma_K
@@ -259,46 +368,36 @@ def cmd_phase(cfg, rng=None):
     K, M = cfg.ph_K, cfg.ph_M
     N, P = 2 * M + 1, M
     L = 2 * N
-    w = toeplitz_weights(N, P)
-    gn = gnorm_factory(w)
     gaps = np.array(cfg.ph_gaps)
     psnrs = np.array(cfg.ph_psnrs, dtype=float)
     succ = np.zeros((len(psnrs), len(gaps)), dtype=int)
     mu_all = [[] for _ in gaps]
     sK_all = [[] for _ in gaps]
     others = 0.5 + 0.16 * np.arange(max(K - 2, 0))
+    tasks = []
     for _sd in cfg.seeds:
         rng = np.random.default_rng(_sd)
         for gi, g in enumerate(gaps):
-            for _ in range(cfg.ph_trials):
-                t0 = rng.uniform(0, 1)
+            for trial in range(cfg.ph_trials):
+                r = _task_rng(cfg, rng, _sd, 'phase', gi, trial)
+                t0 = r.uniform(0, 1)
                 t = np.mod(np.concatenate([[t0, t0 + g], t0 + others]), 1.0)
-                a = np.exp(1j * rng.uniform(0, 2 * np.pi, K))
-                xstar = fri_fourier(t, a, M)
-                sK = float(
-                    svd(build_toeplitz(xstar, N, P), compute_uv=False)[K - 1])
-                sK_all[gi].append(sK)
-                G = measurement_operator(N, L, M, rng)
-                mu_all[gi].append(mu_restricted(G, w, t, a, M))
-                Gp = pinv(G, rcond=1e-6)
-                for pi, ps in enumerate(psnrs):
+                a = np.exp(1j * r.uniform(0, 2 * np.pi, K))
+                G = measurement_operator(N, L, M, r)
+                E = []
+                for ps in psnrs:
                     sig = np.exp(-ps / 10.0)  # R = max|a_k| = 1
-                    eps = sig * (rng.standard_normal(L) +
-                                 1j * rng.standard_normal(L)) / np.sqrt(2)
-                    y = G @ xstar + eps
-                    xh, _ = gcpgd(y,
-                                  G,
-                                  Gp @ y,
-                                  N,
-                                  P,
-                                  K,
-                                  w,
-                                  n_cadzow=cfg.ph_ncad,
-                                  alpha=0.5,
-                                  max_iter=cfg.ph_maxit,
-                                  tol=1e-12)
-                    if gn(xh - xstar) <= 0.1 * sK:
-                        succ[pi, gi] += 1
+                    E.append(sig * (r.standard_normal(L) +
+                                    1j * r.standard_normal(L)) / np.sqrt(2))
+                tasks.append((cfg, t, a, G, E))
+    results = iter(_pmap(cfg, _phase_task, tasks))
+    for _sd in cfg.seeds:
+        for gi, g in enumerate(gaps):
+            for _ in range(cfg.ph_trials):
+                sK, mu, ok = next(results)
+                sK_all[gi].append(sK)
+                mu_all[gi].append(mu)
+                succ[:, gi] += ok
             print(
                 f'[seed={_sd} gap={g:.4f}] '
                 f'med sigma_K={np.median(sK_all[gi]):.3f} '
@@ -431,6 +530,50 @@ def _phase_emit(cfg,
         print('plot skipped:', e)
 
 
+def _vanilla_task(cfg, ps, trials):
+    r"""Score one-shot Cadzow and GCPGD(Id) on a block of trials of one PSNR."""
+    K, M = cfg.va_K, cfg.va_M
+    N, P = 2 * M + 1, M
+    w = toeplitz_weights(N, P)
+    gn = gnorm_factory(w)
+    G = IdentityOperator(N)
+    rows = []
+    # one-shot Cadzow, run to convergence, batched over the trials
+    x_cads = cadzow_denoiser(np.array([tr[2] for tr in trials]), N, P, K,
+                             cfg.va_ncad_oneshot, w)
+    x_gcs = []
+    for _, _, y in trials:
+        # GCPGD with G = Id, warm start y
+        x_gc, _ = gcpgd(y,
+                        G,
+                        y.copy(),
+                        N,
+                        P,
+                        K,
+                        w,
+                        n_cadzow=cfg.va_ncad,
+                        alpha=0.5,
+                        max_iter=cfg.va_maxit,
+                        tol=1e-10)
+        x_gcs.append(x_gc)
+    # locations and their errors for all trials of a method at once
+    T = np.array([tr[0] for tr in trials])
+    est = {'cadzow': x_cads, 'gcpgd': np.array(x_gcs)}
+    terrs = {tag: circular_match_error(
+        T, recover_locations(X, N, P, K, method=cfg.loc_method))
+        for tag, X in est.items()}
+    for i, (_, xs, _) in enumerate(trials):
+        for tag in ('cadzow', 'gcpgd'):
+            xh = est[tag][i]
+            rows.append((
+                ps,
+                tag,
+                float(np.linalg.norm(xh - xs)),  # l2
+                gn(xh - xs),  # Gamma
+                float(terrs[tag][i])))
+    return rows
+
+
 def cmd_vanilla(cfg, rng=None):
     r"""Vanilla FRI denoising (G = Id): GCPGD(Id) versus one-shot Cadzow.
 
@@ -442,45 +585,25 @@ def cmd_vanilla(cfg, rng=None):
     metric for i.i.d. coefficient noise. Reported: coefficient error in both
     metrics and matched location error, medians over the ensemble."""
     K, M = cfg.va_K, cfg.va_M
-    N, P = 2 * M + 1, M
-    w = toeplitz_weights(N, P)
-    gn = gnorm_factory(w)
-    G = np.eye(N, dtype=complex)
-    rows = []
+    N = 2 * M + 1
+    tasks = []
+    blocks = _trial_blocks(cfg, cfg.va_trials,
+                           len(cfg.seeds) * len(cfg.va_psnrs))
     for _sd in cfg.seeds:
         rng = np.random.default_rng(_sd)
-        for ps in cfg.va_psnrs:
-            for _ in range(cfg.va_trials):
-                t = sample_locations(K, cfg.va_delta, rng)
-                a = np.exp(1j * rng.uniform(0, 2 * np.pi, K))
+        for ip, ps in enumerate(cfg.va_psnrs):
+            trials = []
+            for trial in range(cfg.va_trials):
+                r = _task_rng(cfg, rng, _sd, 'vanilla', ip, trial)
+                t = sample_locations(K, cfg.va_delta, r)
+                a = np.exp(1j * r.uniform(0, 2 * np.pi, K))
                 xs = fri_fourier(t, a, M)
                 sig = np.exp(-ps / 10.0)
-                eps = sig * (rng.standard_normal(N) +
-                             1j * rng.standard_normal(N)) / np.sqrt(2)
-                y = xs + eps
-                # one-shot Cadzow, run to convergence
-                x_cad = cadzow_denoiser(y, N, P, K, cfg.va_ncad_oneshot, w)
-                # GCPGD with G = Id, warm start y
-                x_gc, _ = gcpgd(y,
-                                G,
-                                y.copy(),
-                                N,
-                                P,
-                                K,
-                                w,
-                                n_cadzow=cfg.va_ncad,
-                                alpha=0.5,
-                                max_iter=cfg.va_maxit,
-                                tol=1e-10)
-                for tag, xh in (('cadzow', x_cad), ('gcpgd', x_gc)):
-                    terr = circular_match_error(t,
-                                                recover_locations(xh, N, P, K))
-                    rows.append((
-                        ps,
-                        tag,
-                        float(np.linalg.norm(xh - xs)),  # l2
-                        gn(xh - xs),  # Gamma
-                        float(terr)))
+                eps = sig * (r.standard_normal(N) +
+                             1j * r.standard_normal(N)) / np.sqrt(2)
+                trials.append((t, xs, xs + eps))
+            tasks += [(cfg, ps, trials[b.start:b.stop]) for b in blocks]
+    rows = [r for block in _pmap(cfg, _vanilla_task, tasks) for r in block]
     _write_csv(cfg, 'vanilla',
                ['psnr', 'method', 'err_l2', 'err_gamma', 'err_loc'], rows)
     try:
@@ -527,44 +650,57 @@ def cmd_vanilla(cfg, rng=None):
               ' '.join(f'{x:.3f}' for x in rat))
 
 
+def _certificate_task(cfg, K, M, dsep, X, Ds):
+    r"""Drift-certificate rows of one (K, M, Delta) cell."""
+    N, P = 2 * M + 1, M
+    w = toeplitz_weights(N, P)
+    delta = 0.05
+    rows = []
+    certs = check_nontangentiality_batch(np.array(X), N, P, K)
+    for x, d, c_cert in zip(X, Ds, certs['c']):
+        Ms = build_toeplitz(x, N, P)
+        sK = float(svd(Ms, compute_uv=False)[K - 1])
+        r = (1 - delta) / (2 - delta) * sK
+        D = project_toeplitz(build_toeplitz(d, N, P), N, P, w)
+        D /= np.linalg.norm(D)
+        Mk = Ms + r * D
+        d0 = np.linalg.norm(Mk - Ms)
+        prod, drift, in_tube = 1.0, 0.0, True
+        for _k in range(cfg.ce_ncyc):
+            sv = svd(Mk, compute_uv=False)
+            rho = float(sv[K] / sv[K - 1])
+            if rho > 1 - delta:
+                in_tube = False
+            prod *= (1 - min(rho, 1 - 1e-12))**-0.5
+            Mk = project_toeplitz(project_rank(Mk, K), N, P, w)
+            drift = max(drift, np.linalg.norm(Mk - Ms) / d0)
+        rows.append((K, M, dsep, round(float(c_cert), 5), round(sK, 4),
+                     round(prod - 1, 5), round(drift, 5), int(in_tube)))
+    return rows
+
+
 def cmd_certificate(cfg, rng=None):
     r"""A posteriori drift certificate (Remark 2): run the Cadzow inner loop
     from the theorem's own radius r_delta, accumulate the Lemma-1 product
     1+eps_hat = prod (1-rho_k)^{-1/2}, check G_delta membership, and compare
     the certified bound with the measured drift (bound must dominate)."""
-    rows = []
-    delta = 0.05
+    tasks = []
     for _sd in cfg.seeds:
         rng = np.random.default_rng(_sd)
-        for (K, M) in cfg.ce_KM:
-            N, P = 2 * M + 1, M
-            w = toeplitz_weights(N, P)
-            for dsep in cfg.ce_deltas:
-                for _ in range(cfg.ce_trials):
-                    t = sample_locations(K, dsep, rng)
-                    a = np.exp(1j * rng.uniform(0, 2 * np.pi, K))
-                    x = fri_fourier(t, a, M)
-                    Ms = build_toeplitz(x, N, P)
-                    sK = float(svd(Ms, compute_uv=False)[K - 1])
-                    cert = check_nontangentiality(x, N, P, K)
-                    r = (1 - delta) / (2 - delta) * sK
-                    d = rng.standard_normal(N) + 1j * rng.standard_normal(N)
-                    D = project_toeplitz(build_toeplitz(d, N, P), N, P, w)
-                    D /= np.linalg.norm(D)
-                    Mk = Ms + r * D
-                    d0 = np.linalg.norm(Mk - Ms)
-                    prod, drift, in_tube = 1.0, 0.0, True
-                    for _k in range(cfg.ce_ncyc):
-                        sv = svd(Mk, compute_uv=False)
-                        rho = float(sv[K] / sv[K - 1])
-                        if rho > 1 - delta:
-                            in_tube = False
-                        prod *= (1 - min(rho, 1 - 1e-12))**-0.5
-                        Mk = project_toeplitz(project_rank(Mk, K), N, P, w)
-                        drift = max(drift, np.linalg.norm(Mk - Ms) / d0)
-                    rows.append((K, M, dsep, round(cert['c'], 5), round(sK, 4),
-                                 round(prod - 1, 5), round(drift,
-                                                           5), int(in_tube)))
+        for ik, (K, M) in enumerate(cfg.ce_KM):
+            N = 2 * M + 1
+            for idel, dsep in enumerate(cfg.ce_deltas):
+                X, Ds = [], []
+                for trial in range(cfg.ce_trials):
+                    r = _task_rng(cfg, rng, _sd, 'certificate', ik, idel,
+                                  trial)
+                    t = sample_locations(K, dsep, r)
+                    a = np.exp(1j * r.uniform(0, 2 * np.pi, K))
+                    X.append(fri_fourier(t, a, M))
+                    Ds.append(r.standard_normal(N) +
+                              1j * r.standard_normal(N))
+                tasks.append((cfg, K, M, dsep, X, Ds))
+    rows = [r for block in _pmap(cfg, _certificate_task, tasks) for r in block]
     _write_csv(
         cfg, 'certificate',
         ['K', 'M', 'delta', 'c', 'sigma_K', 'eps_hat', 'drift', 'in_tube'],
@@ -673,25 +809,50 @@ def cmd_phase_aggregate(cfg, rng=None):
                 seeds_tag=f'aggregated:{len(dirs)}runs')
 
 
+def _outer_task(cfg, ctx, xstar, psnr, E):
+    r"""Limiting errors of one noise level of the outer experiment."""
+    K, M = cfg.ou_K, cfg.ou_M
+    N, P = 2 * M + 1, M
+    w = toeplitz_weights(N, P)
+    gn = gnorm_factory(w)
+    Yb = xstar @ ctx.G.T + E
+    Xh, _, _ = gcpgd_batch(Yb,
+                           ctx,
+                           ctx.lstsq(Yb),
+                           N,
+                           P,
+                           K,
+                           w,
+                           n_cadzow=cfg.ou_ncad,
+                           alpha=0.5,
+                           max_iter=cfg.ou_maxit,
+                           tol=1e-8)
+    fin = [(float(np.linalg.norm(eps)), gn(xh - xstar))
+           for eps, xh in zip(E, Xh)]
+    return [(psnr, ne, er) for ne, er in fin]
+
+
 def cmd_outer(cfg, rng):
     K, M = cfg.ou_K, cfg.ou_M
     N, P = 2 * M + 1, M
     L = 2 * N  # oversampled: global mu is degenerate for irregular Fourier at L=N
     w = toeplitz_weights(N, P)
     gn = gnorm_factory(w)
-    t = sample_locations(K, cfg.ou_delta, rng)
-    a = np.exp(1j * rng.uniform(0, 2 * np.pi, K))
+    seed = getattr(cfg, '_seed', cfg.seeds[0])
+    r = _task_rng(cfg, rng, seed, 'outer')
+    t = sample_locations(K, cfg.ou_delta, r)
+    a = np.exp(1j * r.uniform(0, 2 * np.pi, K))
     xstar = fri_fourier(t, a, M)
     sK = float(svd(build_toeplitz(xstar, N, P), compute_uv=False)[K - 1])
-    G = measurement_operator(N, L, M, rng)
-    muG = mu_restricted(G, w, t, a, M)
-    Gs = G * (1.0 / np.sqrt(w))[None, :]
-    tau = 1.0 / (2.0 * np.linalg.norm(Gs, 2)**2)
+    G = measurement_operator(N, L, M, r)
+    ctx = MeasurementContext(G, w)
+    muG = mu_restricted(ctx, w, t, a, M)
+    tau = ctx.tau
     q = np.sqrt(max(0.0, 1 - 2 * tau * muG**2))
     qt = (1 + q) / 2
     # (a) noiseless linear rate
     y = G @ xstar
-    d = rng.standard_normal(N) + 1j * rng.standard_normal(N)
+    d = r.standard_normal(N) + 1j * r.standard_normal(N)
     x = xstar + 0.2 * sK * d / gn(d)
     errs = []
     Gh = G.conj().T
@@ -708,27 +869,17 @@ def cmd_outer(cfg, rng):
     print(f'noiseless outer rate: measured {slope:.4f}  vs  q-tilde bound '
           f'{qt:.4f} (q = {q:.4f}, mu_Gamma = {muG:.3f})')
     # (b) noise linearity
-    rows = []
-    for psnr in cfg.ou_psnrs:
+    tasks = []
+    for ip, psnr in enumerate(cfg.ou_psnrs):
         sig = np.exp(-psnr / 10.0)
-        fin = []
-        for _ in range(cfg.ou_trials):
-            eps = sig * (rng.standard_normal(L) +
-                         1j * rng.standard_normal(L)) / np.sqrt(2)
-            yb = G @ xstar + eps
-            xh, _ = gcpgd(yb,
-                          G,
-                          pinv(G) @ yb,
-                          N,
-                          P,
-                          K,
-                          w,
-                          n_cadzow=cfg.ou_ncad,
-                          alpha=0.5,
-                          max_iter=cfg.ou_maxit,
-                          tol=1e-8)
-            fin.append((float(np.linalg.norm(eps)), gn(xh - xstar)))
-        rows += [(psnr, ne, er) for ne, er in fin]
+        E = []
+        for trial in range(cfg.ou_trials):
+            r = _task_rng(cfg, rng, seed, 'outer', ip, trial)
+            E.append(sig * (r.standard_normal(L) + 1j * r.standard_normal(L)) /
+                     np.sqrt(2))
+        E = np.array(E)
+        tasks.append((cfg, ctx, xstar, psnr, E))
+    rows = [r for block in _pmap(cfg, _outer_task, tasks) for r in block]
     _write_csv(cfg, 'outer_noise', ['psnr', 'eps_norm', 'err_gamma'], rows)
     ne = np.array([r[1] for r in rows])
     er = np.array([r[2] for r in rows])
@@ -782,51 +933,57 @@ def cmd_outer(cfg, rng):
 # --------------------------------------------------------------------------- #
 #  lipschitz
 # --------------------------------------------------------------------------- #
+def _lipschitz_task(cfg, P, K, samples, samples_2):
+    r"""Lipschitz ratios of H_n over the run pairs of one (P, K)."""
+    N = 2 * P + 1
+    w = toeplitz_weights(N, P)
+    # one batched denoiser call per stack of runs
+    fs_hats = cadzow_denoiser(samples, N, P, K, cfg.lip_ncad, w)
+    fs_hats_2 = cadzow_denoiser(samples_2, N, P, K, cfg.lip_ncad, w)
+    lip_const_vals = []
+    for n_run in range(cfg.lip_runs):
+        num = np.linalg.norm(fs_hats_2[n_run] - fs_hats[n_run])
+        den = np.linalg.norm(samples_2[n_run] - samples[n_run])
+        lip_const_vals.append(num / den if den > 1e-12 else 0.0)
+    return lip_const_vals
+
+
 def cmd_lipschitz(cfg, rng=None):
     r"""Lipschitz constant of Cadzow Denoising (Section IV.A)."""
     if rng is None:
         rng = np.random.default_rng(cfg.seeds[0])
     from collections import defaultdict
     lip_const_dict = defaultdict(dict)
-    rows = []
+    rows, tasks = [], []
 
-    for P in cfg.lip_Ps:
+    for ip, P in enumerate(cfg.lip_Ps):
         N = 2 * P + 1
-        w = toeplitz_weights(N, P)
-        for K in cfg.lip_Ks:
+        for ik, K in enumerate(cfg.lip_Ks):
             if K > P:
                 continue
+            r = _task_rng(cfg, rng, cfg.seeds[0], 'lipschitz', ip, ik)
 
             # Sample the hypercube randomly
             low = -1.0
             diameter = 2.0
 
-            random_samps = (rng.uniform(0, 1, (cfg.lip_runs, N)) +
-                            1j * rng.uniform(0, 1, (cfg.lip_runs, N)))
-            random_samps_2 = (rng.uniform(0, 1, (cfg.lip_runs, N)) +
-                              1j * rng.uniform(0, 1, (cfg.lip_runs, N)))
+            random_samps = (r.uniform(0, 1, (cfg.lip_runs, N)) +
+                            1j * r.uniform(0, 1, (cfg.lip_runs, N)))
+            random_samps_2 = (r.uniform(0, 1, (cfg.lip_runs, N)) +
+                              1j * r.uniform(0, 1, (cfg.lip_runs, N)))
 
             samples = low + diameter * random_samps / np.abs(random_samps)
             samples_2 = low + diameter * random_samps_2 / np.abs(
                 random_samps_2)
+            tasks.append((cfg, P, K, samples, samples_2))
 
-            lip_const_vals = []
-            for n_run in range(cfg.lip_runs):
-                fs_hat = cadzow_denoiser(samples[n_run], N, P, K, cfg.lip_ncad,
-                                         w)
-                fs_hat_2 = cadzow_denoiser(samples_2[n_run], N, P, K,
-                                           cfg.lip_ncad, w)
-
-                num = np.linalg.norm(fs_hat_2 - fs_hat)
-                den = np.linalg.norm(samples_2[n_run] - samples[n_run])
-                val = num / den if den > 1e-12 else 0.0
-                lip_const_vals.append(val)
-                rows.append((P, K, n_run, val))
-
-            lip_const_dict[P][K] = lip_const_vals
-            print(
-                f"P = {P} - K = {K} - Estimated Lip. const: {np.mean(lip_const_vals):.4f}"
-            )
+    for (_, P, K, _, _), lip_const_vals in zip(
+            tasks, _pmap(cfg, _lipschitz_task, tasks)):
+        rows += [(P, K, n_run, val) for n_run, val in enumerate(lip_const_vals)]
+        lip_const_dict[P][K] = lip_const_vals
+        print(
+            f"P = {P} - K = {K} - Estimated Lip. const: {np.mean(lip_const_vals):.4f}"
+        )
 
     _write_csv(cfg, 'lipschitz', ['P', 'K', 'run', 'lip_val'], rows)
 
@@ -878,8 +1035,102 @@ def cmd_lipschitz(cfg, rng=None):
 # --------------------------------------------------------------------------- #
 #  simulation
 # --------------------------------------------------------------------------- #
+def _simulation_task(cfg, beta_val, last, ctx, fs_coeff, locations, _sd, ps,
+                     trials, noise):
+    r"""CPGD, GCPGD and GenFRI on a block of noisy trials (indices trials) of
+    one (beta, seed, psnr)."""
+    import time
+    K = cfg.sim_K
+    M = beta_val * K
+    P = M
+    N = 2 * M + 1
+    w = toeplitz_weights(N, P)
+    data_noiseless = ctx.G @ fs_coeff
+    methods = ('CPGD', 'GCPGD', 'GenFRI')
+    est = {m: [] for m in methods}
+    runs, subspaces = [], []
+
+    for eps in noise:
+        data_noisy = data_noiseless + eps
+
+        rho = np.linalg.norm(data_noisy) if last else np.inf
+        x_cpgd, iter_cpgd, time_cpgd = run_cpgd(data_noisy,
+                                                ctx,
+                                                N,
+                                                P,
+                                                K,
+                                                w,
+                                                cfg.sim_ncad,
+                                                max_iter=cfg.sim_maxit,
+                                                tol=1e-7,
+                                                rho=rho)
+        est['CPGD'].append(x_cpgd)
+
+        x0_gcpgd = np.zeros(N, dtype=complex)
+        t_start_gcpgd = time.time()
+        x_gcpgd, _, iter_gcpgd, info = gcpgd(data_noisy,
+                                             ctx,
+                                             x0_gcpgd,
+                                             N,
+                                             P,
+                                             K,
+                                             w,
+                                             n_cadzow=cfg.sim_ncad,
+                                             alpha=0.5,
+                                             max_iter=cfg.sim_maxit,
+                                             tol=1e-7,
+                                             return_iter=True,
+                                             return_info=True)
+        time_gcpgd = time.time() - t_start_gcpgd
+        est['GCPGD'].append(x_gcpgd)
+        subspaces.append(info['subspace'])
+
+        x_genfri, iter_genfri, time_genfri = run_genfri(data_noisy,
+                                                        ctx,
+                                                        N,
+                                                        P,
+                                                        K,
+                                                        max_iter=50,
+                                                        nb_init=15,
+                                                        tol=1e-6,
+                                                        rcond=1e-4,
+                                                        seed=_sd)
+        est['GenFRI'].append(x_genfri)
+        runs.append({'CPGD': (time_cpgd, iter_cpgd),
+                     'GCPGD': (time_gcpgd, iter_gcpgd),
+                     'GenFRI': (time_genfri, iter_genfri)})
+
+    # locations of all trials of a method from one (stacked) recovery call,
+    # scored against the shared true locations in one call as well; esprit
+    # reuses the signal subspace of GCPGD's last Cadzow projection
+    reuse = {}
+    if cfg.loc_method == 'esprit':
+        reuse['GCPGD'] = tuple(np.array(f) for f in zip(*subspaces))
+    errs, pos_errs = {}, {}
+    for m in methods:
+        errs[m] = [float(np.linalg.norm(x - fs_coeff)) for x in est[m]]
+        pos_errs[m] = average_match_error(
+            locations, recover_locations(np.array(est[m]), N, P, K,
+                                         method=cfg.loc_method,
+                                         subspace=reuse.get(m)))
+    rows = []
+    for i, (trial_idx, run) in enumerate(zip(trials, runs)):
+        for m in methods:
+            rows.append((beta_val, ps, _sd, trial_idx, m, errs[m][i],
+                         float(pos_errs[m][i])) + run[m])
+    return rows, errs
+
+
 def cmd_simulation(cfg, rng=None):
-    r"""Reconstruction accuracy of CPGD, GCPGD, and GenFRI (Section V.A)."""
+    r"""Reconstruction accuracy of CPGD, GCPGD, and GenFRI (Section V.A).
+
+    The 'time' column is the solve time of one method on one trial. The norms,
+    Gram and pseudo-inverse of G are computed once per beta, before the timed
+    calls, and that setup time is printed per beta. The trials of every beta
+    go to one worker pool in blocks; with more than one worker, each time is
+    measured while the other workers compete for the cores and memory
+    bandwidth, so compare times from --workers 1 runs only.
+    """
     import time
     import warnings
     import scipy.linalg as splin
@@ -905,6 +1156,10 @@ def cmd_simulation(cfg, rng=None):
         for b in cfg.sim_beta
     }
 
+    tasks = []
+    blocks = _trial_blocks(
+        cfg, cfg.sim_trials,
+        len(cfg.sim_beta) * len(cfg.seeds) * len(cfg.sim_psnrs))
     for b_idx, beta_val in enumerate(cfg.sim_beta):
         M = beta_val * K
         P = M
@@ -921,91 +1176,52 @@ def cmd_simulation(cfg, rng=None):
         G = np.exp(2j * np.pi * np.outer(sampling_locations, frequencies))
 
         fs_coeff = fri_fourier(locations, intensities, M)
-        data_noiseless = G @ fs_coeff
-
-        print(f"********** N={N}, L={L} **********")
-
+        # G is fixed for this beta: compute its norms, Gram and pseudo-inverse
+        # once, outside the timed solver calls
+        t_setup = time.time()
+        ctx = MeasurementContext(G, w)
+        ctx.spectral_norm()
+        ctx.spectral_norm(w)
+        ctx.gram
+        ctx.pinv(1e-4)
+        t_setup = time.time() - t_setup
+
+        print(f"shared setup of G (norms, Gram, pinv) for N={N}, L={L}: "
+              f"{t_setup:.4f} s")
+
+        # noise is drawn serially in the original (seed, psnr, trial) order,
+        # so the results do not depend on how the blocks are scheduled
+        last = b_idx == len(cfg.sim_beta) - 1
         for _sd in cfg.seeds:
             rng_trial = np.random.default_rng(_sd)
-            for ps in cfg.sim_psnrs:
+            for ip, ps in enumerate(cfg.sim_psnrs):
                 noise_lvl = np.max(intensities) * np.exp(-ps / 10.0)
-
-                for trial_idx in range(cfg.sim_trials):
-                    std_noise = rng_trial.standard_normal(L)
-                    data_noisy = data_noiseless + noise_lvl * std_noise
-
-                    rho = np.linalg.norm(data_noisy) if (b_idx
-                                                         == len(cfg.sim_beta) -
-                                                         1) else np.inf
-                    x_cpgd, iter_cpgd, time_cpgd = run_cpgd(
-                        data_noisy,
-                        G,
-                        N,
-                        P,
-                        K,
-                        w,
-                        cfg.sim_ncad,
-                        max_iter=cfg.sim_maxit,
-                        tol=1e-7,
-                        rho=rho)
-                    err_cpgd = float(np.linalg.norm(x_cpgd - fs_coeff))
-                    loc_cpgd = recover_locations(x_cpgd, N, P, K)
-                    pos_err_cpgd = average_match_error(locations, loc_cpgd)
-
-                    results_data[beta_val][ps]['CPGD'].append(err_cpgd)
-                    rows.append((beta_val, ps, _sd, trial_idx, 'CPGD',
-                                 err_cpgd, pos_err_cpgd, time_cpgd, iter_cpgd))
-
-                    x0_gcpgd = np.zeros(N, dtype=complex)
-                    t_start_gcpgd = time.time()
-                    x_gcpgd, _, iter_gcpgd = gcpgd(data_noisy,
-                                                   G,
-                                                   x0_gcpgd,
-                                                   N,
-                                                   P,
-                                                   K,
-                                                   w,
-                                                   n_cadzow=cfg.sim_ncad,
-                                                   alpha=0.5,
-                                                   max_iter=cfg.sim_maxit,
-                                                   tol=1e-7,
-                                                   return_iter=True)
-                    time_gcpgd = time.time() - t_start_gcpgd
-                    err_gcpgd = float(np.linalg.norm(x_gcpgd - fs_coeff))
-                    loc_gcpgd = recover_locations(x_gcpgd, N, P, K)
-                    pos_err_gcpgd = average_match_error(locations, loc_gcpgd)
-
-                    results_data[beta_val][ps]['GCPGD'].append(err_gcpgd)
-                    rows.append(
-                        (beta_val, ps, _sd, trial_idx, 'GCPGD', err_gcpgd,
-                         pos_err_gcpgd, time_gcpgd, iter_gcpgd))
-
-                    x_genfri, iter_genfri, time_genfri = run_genfri(
-                        data_noisy,
-                        G,
-                        N,
-                        P,
-                        K,
-                        max_iter=50,
-                        nb_init=15,
-                        tol=1e-6,
-                        rcond=1e-4,
-                        seed=_sd)
-                    err_genfri = float(np.linalg.norm(x_genfri - fs_coeff))
-                    loc_genfri = recover_locations(x_genfri, N, P, K)
-                    pos_err_genfri = average_match_error(locations, loc_genfri)
-
-                    results_data[beta_val][ps]['GenFRI'].append(err_genfri)
-                    rows.append(
-                        (beta_val, ps, _sd, trial_idx, 'GenFRI', err_genfri,
-                         pos_err_genfri, time_genfri, iter_genfri))
-
-                m_c = np.median(results_data[beta_val][ps]['CPGD'])
-                m_g = np.median(results_data[beta_val][ps]['GCPGD'])
-                m_f = np.median(results_data[beta_val][ps]['GenFRI'])
-                print(
-                    f"PSNR = {ps:3d} dB | Median Coeff Err: CPGD={m_c:.4f}, GCPGD={m_g:.4f}, GenFRI={m_f:.4f}"
-                )
+                noise = noise_lvl * np.array([
+                    _task_rng(cfg, rng_trial, _sd, 'simulation', ip,
+                              trial).standard_normal(L)
+                    for trial in range(cfg.sim_trials)
+                ])
+                tasks += [(cfg, beta_val, last, ctx, fs_coeff, locations,
+                           _sd, ps, b, noise[b.start:b.stop]) for b in blocks]
+
+    # one pool for the blocks of every beta
+    for task, (block_rows, errs) in zip(tasks,
+                                        _pmap(cfg, _simulation_task, tasks)):
+        beta_val, _sd, ps, trials = task[1], task[6], task[7], task[8]
+        rows += block_rows
+        for method, err in errs.items():
+            results_data[beta_val][ps][method] += err
+        if trials.start == 0 and ps == cfg.sim_psnrs[0] and (
+                _sd == cfg.seeds[0]):
+            print(f"********** N={2 * beta_val * K + 1}, "
+                  f"L={2 * K + 1} **********")
+        if trials.stop == cfg.sim_trials:
+            m_c = np.median(results_data[beta_val][ps]['CPGD'])
+            m_g = np.median(results_data[beta_val][ps]['GCPGD'])
+            m_f = np.median(results_data[beta_val][ps]['GenFRI'])
+            print(
+                f"PSNR = {ps:3d} dB | Median Coeff Err: CPGD={m_c:.4f}, GCPGD={m_g:.4f}, GenFRI={m_f:.4f}"
+            )
 
     _write_csv(cfg, 'simulation', [
         'beta', 'psnr', 'seed', 'trial', 'method', 'err_coeff', 'err_loc',
@@ -1127,6 +1343,22 @@ def parse():
                    help='integer seed, or comma-separated list '
                    'for in-process multi-seed pooling')
     p.add_argument('--outdir', default='.')
+    p.add_argument('--workers',
+                   type=int,
+                   default=1,
+                   help='worker processes for the independent trials '
+                   '(output does not depend on it)')
+    p.add_argument('--rng-mode',
+                   default='legacy',
+                   choices=['legacy', 'spawn'],
+                   help='legacy: one serial stream per seed (the original '
+                   'draws); spawn: an independent SeedSequence stream per '
+                   'trial')
+    p.add_argument('--loc-method',
+                   default='roots',
+                   choices=['roots', 'esprit'],
+                   help='location recovery used to score the estimates '
+                   '(vanilla, simulation)')
     p.add_argument(
         '--inputs',
         default='',
@@ -1220,16 +1452,16 @@ if __name__ == '__main__':
             print(f'===== {k} =====')
             if k == 'outer' and len(cfg.seeds) > 1:
                 for _sd in cfg.seeds:
-                    cfg._sfx = f'_s{_sd}'
+                    cfg._sfx, cfg._seed = f'_s{_sd}', _sd
                     cmds[k](cfg, np.random.default_rng(_sd))
-                cfg._sfx = ''
+                cfg._sfx, cfg._seed = '', cfg.seeds[0]
             else:
                 cmds[k](cfg, rng)
     elif cfg.cmd == 'outer' and len(cfg.seeds) > 1:
         for _sd in cfg.seeds:
-            cfg._sfx = f'_s{_sd}'
+            cfg._sfx, cfg._seed = f'_s{_sd}', _sd
             cmds['outer'](cfg, np.random.default_rng(_sd))
-        cfg._sfx = ''
+        cfg._sfx, cfg._seed = '', cfg.seeds[0]
     else:
         cmds[cfg.cmd](cfg, rng)
     print('done.')